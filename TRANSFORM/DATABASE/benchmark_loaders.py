@@ -0,0 +1,69 @@
+"""
+Compare load throughput of the COPY and to_sql loaders
+Loads each table once per loader and reports rows/second.
+
+Usage: python benchmark_loaders.py [table_key ...]
+"""
+import sys
+from load_data import *
+
+tables_to_benchmark = sys.argv[1:] or [
+    'player_performances',
+    'player_teammates_played_with'
+]
+loaders = ['to_sql', 'copy']
+
+print("Starting loader benchmark...")
+
+# Create connections
+engine = create_sqlalchemy_engine()
+conn = create_connection()
+
+# Disable foreign key constraints
+cursor = conn.cursor()
+cursor.execute("SET session_replication_role = 'replica';")
+conn.commit()
+cursor.close()
+print("✓ Foreign key constraints disabled\n")
+
+results = []
+for table in tables_to_benchmark:
+    for loader in loaders:
+        print(f"\n{'='*60}")
+        print(f"Loading {table} with {loader}...")
+        print('='*60)
+        start = time.perf_counter()
+        success = load_csv_to_table(table, engine, conn, loader=loader)
+        elapsed = time.perf_counter() - start
+
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT COUNT(*) FROM {TABLE_MAPPING[table]['table']};")
+        count = cursor.fetchone()[0]
+        cursor.close()
+        results.append((table, loader, success, count, elapsed))
+
+# Re-enable foreign key constraints
+cursor = conn.cursor()
+cursor.execute("SET session_replication_role = 'origin';")
+conn.commit()
+cursor.close()
+print("\n✓ Foreign key constraints re-enabled")
+
+conn.close()
+engine.dispose()
+
+# Summary
+print("\n" + "="*60)
+print("LOADER BENCHMARK")
+print("="*60)
+print(f"  {'Table':32s} {'Loader':8s} {'Rows':>10s} {'Seconds':>9s} {'Rows/s':>10s}")
+for table, loader, success, count, elapsed in results:
+    rate = count / elapsed if elapsed > 0 else 0
+    status = "" if success else "  (failed)"
+    print(f"  {table:32s} {loader:8s} {count:>10,} {elapsed:>9.1f} {rate:>10,.0f}{status}")
+
+for table in tables_to_benchmark:
+    rates = {loader: count / elapsed for t, loader, success, count, elapsed in results
+             if t == table and success and elapsed > 0}
+    if rates.get('to_sql') and rates.get('copy'):
+        print(f"\n  {table}: copy is {rates['copy'] / rates['to_sql']:.1f}x faster than to_sql")
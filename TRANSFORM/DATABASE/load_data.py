@@ -3,7 +3,16 @@ Football Data ETL - Load CSV data into PostgreSQL
 This script loads all CSV files from the Data directory into the PostgreSQL database.
 """
 
+import io
 import os
+import re
+import json
+import time
+import hashlib
+import functools
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import pandas as pd
 import psycopg2
 from psycopg2 import sql
@@ -13,6 +22,15 @@ from tqdm import tqdm
 import logging
 from datetime import datetime
 
+# Optional: Arrow CSV engine and Parquet cache (both fall back to pandas/CSV when missing)
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -38,12 +56,40 @@ DB_CONFIG = {
 
 DATA_DIR = os.getenv('DATA_DIR', '../../Data')
 
+# Raw schema the CSV parse types are derived from
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'init-db', '01-create-schema.sql')
+
+# VARCHAR columns up to this length hold short repeated labels (season, country,
+# position, competition id...) and are parsed as categoricals
+CATEGORY_MAX_LENGTH = 100
+
+# CSV parser used when a TABLE_MAPPING entry does not set 'engine':
+#   'pandas' - pd.read_csv C parser, one chunk at a time
+#   'arrow'  - pyarrow streaming reader, multithreaded, batches written with COPY
+CSV_ENGINE = os.getenv('CSV_ENGINE', 'pandas')
+ARROW_BLOCK_SIZE = 16 * 1024 ** 2
+
+# Fingerprints of the source files from the last successful load of each table
+MANIFEST_FILE = os.getenv('LOAD_MANIFEST', 'load_manifest.json')
+
 # Mapping of CSV files to database tables
+# 'loader' selects how chunks reach PostgreSQL:
+#   'copy'   - stream each chunk with COPY ... FROM STDIN over psycopg2
+#   'to_sql' - DataFrame.to_sql(method='multi') through SQLAlchemy
+# 'split_workers' > 1 parses and loads newline-aligned byte ranges of the file
+# in that many worker processes, each on its own connection.
+# 'engine' ('pandas' or 'arrow') overrides CSV_ENGINE for one table.
+# 'depends_on' lists the tables referenced by foreign keys; truncating a parent
+# with CASCADE empties its dependents, so they must be reloaded with it.
+# 'merge_key' lists the columns identifying a row of an append-mostly source;
+# a changed file is then merged into the populated table (merge_csv_into_table)
+# instead of truncating and reloading it.
 TABLE_MAPPING = {
     'player_profiles': {
         'file': 'player_profiles/player_profiles.csv',
         'table': 'player_profiles',
         'chunk_size': 5000,
+        'loader': 'copy',
         'date_columns': ['date_of_birth', 'joined', 'contract_expires', 
                         'date_of_last_contract_extension', 'contract_there_expires', 'date_of_death']
     },
@@ -51,61 +97,81 @@ TABLE_MAPPING = {
         'file': 'player_injuries/player_injuries.csv',
         'table': 'player_injuries',
         'chunk_size': 10000,
-        'date_columns': ['from_date', 'end_date']
+        'loader': 'copy',
+        'date_columns': ['from_date', 'end_date'],
+        'depends_on': ['player_profiles']
     },
     'player_market_value': {
         'file': 'player_market_value/player_market_value.csv',
         'table': 'player_market_value',
         'chunk_size': 20000,
-        'date_columns': ['date_unix']
+        'loader': 'copy',
+        'date_columns': ['date_unix'],
+        'depends_on': ['player_profiles'],
+        'merge_key': ['player_id', 'date_unix']
     },
     'player_latest_market_value': {
         'file': 'player_latest_market_value/player_latest_market_value.csv',
         'table': 'player_latest_market_value',
         'chunk_size': 10000,
-        'date_columns': ['date_unix']
+        'loader': 'copy',
+        'date_columns': ['date_unix'],
+        'depends_on': ['player_profiles']
     },
     'player_national_performances': {
         'file': 'player_national_performances/player_national_performances.csv',
         'table': 'player_national_performances',
         'chunk_size': 10000,
-        'date_columns': ['first_game_date']
+        'loader': 'copy',
+        'date_columns': ['first_game_date'],
+        'depends_on': ['player_profiles']
     },
     'player_performances': {
         'file': 'player_performances/player_performances.csv',
         'table': 'player_performances',
         'chunk_size': 50000,
-        'date_columns': []
+        'split_workers': 4,
+        'loader': 'copy',
+        'date_columns': [],
+        'depends_on': ['player_profiles']
     },
     'player_teammates_played_with': {
         'file': 'player_teammates_played_with/player_teammates_played_with.csv',
         'table': 'player_teammates_played_with',
         'chunk_size': 50000,
-        'date_columns': []
+        'split_workers': 4,
+        'loader': 'copy',
+        'date_columns': [],
+        'depends_on': ['player_profiles']
     },
     'team_details': {
         'file': 'team_details/team_details.csv',
         'table': 'team_details',
         'chunk_size': 5000,
+        'loader': 'copy',
         'date_columns': []
     },
     'team_children': {
         'file': 'team_children/team_children.csv',
         'table': 'team_children',
         'chunk_size': 5000,
+        'loader': 'copy',
         'date_columns': []
     },
     'team_competitions_seasons': {
         'file': 'team_competitions_seasons/team_competitions_seasons.csv',
         'table': 'team_competitions_seasons',
         'chunk_size': 5000,
+        'loader': 'copy',
         'date_columns': []
     },
     'transfer_history': {
         'file': 'transfer_history/transfer_history.csv',
         'table': 'transfer_history',
         'chunk_size': 20000,
-        'date_columns': ['transfer_date']
+        'loader': 'copy',
+        'date_columns': ['transfer_date'],
+        'depends_on': ['player_profiles']
     }
 }
 
@@ -154,75 +220,1098 @@ def check_database_connection():
         return False
 
 
+@functools.lru_cache(maxsize=None)
+def parse_schema_columns(schema_file=SCHEMA_FILE):
+    """Read column names and SQL types of every table in the raw schema DDL"""
+    tables = {}
+    for table_name, body in re.findall(r'CREATE TABLE (\w+) \((.*?)\n\);', open(schema_file, encoding='utf-8').read(), re.S):
+        columns = {}
+        for column, sql_type in re.findall(r'^\s+(\w+) ([A-Z]+(?:\(\d+(?:,\d+)?\))?)', body, re.M):
+            if column not in ('PRIMARY', 'FOREIGN', 'UNIQUE', 'CONSTRAINT'):
+                columns[column] = sql_type
+        tables[table_name] = columns
+    return tables
+
+
+def sql_type_to_dtype(sql_type):
+    """pandas dtype used to parse a column of the given SQL type (None = parse as date)"""
+    base = sql_type.split('(')[0]
+    if base in ('INTEGER', 'SERIAL'):
+        return 'Int32'
+    if base == 'DECIMAL':
+        return 'float64'
+    if base == 'BOOLEAN':
+        return 'boolean'
+    if base == 'DATE':
+        return None
+    if base == 'VARCHAR' and int(sql_type[len('VARCHAR('):-1]) <= CATEGORY_MAX_LENGTH:
+        return 'category'
+    # TEXT, long VARCHAR and TIMESTAMP (passed through to PostgreSQL as text)
+    return 'object'
+
+
+def csv_read_options(config_key, csv_columns):
+    """pd.read_csv keyword arguments derived from the table's schema.
+
+    Integer columns use nullable Int32 so a non-integer value fails at parse
+    time instead of at INSERT time; short labels become categoricals; DATE
+    columns are parsed with a fixed ISO format. Values that still fail date
+    parsing are coerced to NULL by clean_dataframe, as before. Only columns
+    present in the CSV header (csv_columns) are mapped.
+    """
+    schema_columns = parse_schema_columns().get(TABLE_MAPPING[config_key]['table'], {})
+    dtype = {}
+    date_columns = []
+    for column in csv_columns:
+        if column not in schema_columns:
+            continue
+        column_dtype = sql_type_to_dtype(schema_columns[column])
+        if column_dtype is None:
+            date_columns.append(column)
+        else:
+            dtype[column] = column_dtype
+
+    options = {'dtype': dtype}
+    if date_columns:
+        options['parse_dates'] = date_columns
+        options['date_format'] = {column: '%Y-%m-%d' for column in date_columns}
+    return options
+
+
+def sql_type_to_arrow(sql_type):
+    """Arrow type used to parse a column of the given SQL type.
+
+    DATE columns are read as strings and converted by clean_record_batch so
+    that unparseable dates become NULL, as with pandas' errors='coerce'.
+    """
+    base = sql_type.split('(')[0]
+    if base in ('INTEGER', 'SERIAL'):
+        return pa.int32()
+    if base == 'DECIMAL':
+        return pa.float64()
+    if base == 'BOOLEAN':
+        return pa.bool_()
+    return pa.string()
+
+
+def clean_record_batch(batch, date_columns):
+    """Apply clean_dataframe's date coercion to an Arrow record batch"""
+    arrays = []
+    for name, array in zip(batch.schema.names, batch.columns):
+        if name in date_columns and pa.types.is_string(array.type):
+            array = pc.strptime(array, format='%Y-%m-%d', unit='s', error_is_null=True).cast(pa.date32())
+        arrays.append(array)
+    return pa.RecordBatch.from_arrays(arrays, names=batch.schema.names)
+
+
+def open_arrow_csv(source, config_key):
+    """Open a streaming, multithreaded Arrow CSV reader typed from the schema"""
+    schema_columns = parse_schema_columns().get(TABLE_MAPPING[config_key]['table'], {})
+    convert_options = pa_csv.ConvertOptions(
+        column_types={column: sql_type_to_arrow(sql_type) for column, sql_type in schema_columns.items()},
+        null_values=['', 'nan'],
+        strings_can_be_null=True,
+        quoted_strings_can_be_null=True
+    )
+    read_options = pa_csv.ReadOptions(use_threads=True, block_size=ARROW_BLOCK_SIZE)
+    return pa_csv.open_csv(source, read_options=read_options, convert_options=convert_options)
+
+
+def write_record_batch(batch, table_name, loader, engine, conn):
+    """Write one Arrow record batch with the selected loader.
+
+    For COPY the batch is serialized to CSV by Arrow itself, so rows never
+    become Python objects; to_sql still needs a DataFrame.
+    """
+    if loader == 'copy':
+        buffer = io.BytesIO()
+        pa_csv.write_csv(batch, buffer, write_options=pa_csv.WriteOptions(include_header=False))
+        buffer.seek(0)
+        cursor = conn.cursor()
+        cursor.copy_expert(f"COPY {table_name} ({', '.join(batch.schema.names)}) FROM STDIN WITH (FORMAT csv)",
+                           buffer)
+        cursor.close()
+    else:
+        write_chunk(batch.to_pandas(), table_name, loader, engine, conn)
+
+
+def load_csv_with_arrow(config_key, table_name, engine, conn, loader):
+    """Stream a CSV into table_name through pyarrow's multithreaded reader.
+
+    Record batches are cleaned with Arrow compute kernels and handed to
+    write_record_batch. Returns (rows_loaded, chunks_processed).
+    """
+    config = TABLE_MAPPING[config_key]
+    file_path = os.path.join(DATA_DIR, config['file'])
+
+    rows_loaded = 0
+    chunks_processed = 0
+    with open(file_path, 'rb') as source, \
+            tqdm(total=os.path.getsize(file_path), unit='B', unit_scale=True, desc=f"  Loading {table_name}") as pbar:
+        for batch in open_arrow_csv(source, config_key):
+            batch = clean_record_batch(batch, config['date_columns'])
+            write_record_batch(batch, table_name, loader, engine, conn)
+
+            chunks_processed += 1
+            rows_loaded += batch.num_rows
+            pbar.update(source.tell() - pbar.n)
+
+    return rows_loaded, chunks_processed
+
+
+def parquet_cache_path(config_key):
+    """Location of a table's Parquet cache (next to its CSV)"""
+    return os.path.splitext(os.path.join(DATA_DIR, TABLE_MAPPING[config_key]['file']))[0] + '.parquet'
+
+
+def parquet_cache_fresh(config_key):
+    """True when the Parquet cache exists and was built from the current CSV.
+
+    The CSV's size and mtime are stored in the Parquet schema metadata when
+    the cache is built; any change to the CSV invalidates the cache.
+    """
+    if pa is None:
+        return False
+    cache_path = parquet_cache_path(config_key)
+    csv_path = os.path.join(DATA_DIR, TABLE_MAPPING[config_key]['file'])
+    if not os.path.exists(cache_path) or not os.path.exists(csv_path):
+        return False
+
+    metadata = pq.read_schema(cache_path).metadata or {}
+    stat = os.stat(csv_path)
+    return (metadata.get(b'source_size') == str(stat.st_size).encode()
+            and metadata.get(b'source_mtime') == repr(stat.st_mtime).encode())
+
+
+def build_parquet_cache(config_key):
+    """Convert a table's CSV into a typed, zstd-compressed Parquet file.
+
+    Parsing and cleaning follow the Arrow engine, so the cache holds exactly
+    what would be loaded. The file is written under a temporary name and
+    moved into place, so readers never see a partial cache.
+    """
+    config = TABLE_MAPPING[config_key]
+    csv_path = os.path.join(DATA_DIR, config['file'])
+    cache_path = parquet_cache_path(config_key)
+    stat = os.stat(csv_path)
+    source_metadata = {b'source_size': str(stat.st_size).encode(), b'source_mtime': repr(stat.st_mtime).encode()}
+
+    writer = None
+    rows = 0
+    try:
+        with open(csv_path, 'rb') as source:
+            for batch in open_arrow_csv(source, config_key):
+                batch = clean_record_batch(batch, config['date_columns'])
+                if writer is None:
+                    schema = batch.schema.with_metadata(source_metadata)
+                    writer = pq.ParquetWriter(cache_path + '.tmp', schema, compression='zstd')
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is not None:
+        os.replace(cache_path + '.tmp', cache_path)
+    logger.info(f"✓ Cached {config_key}: {rows:,} rows, {stat.st_size / 1024 ** 2:,.1f} MB CSV → "
+                f"{os.path.getsize(cache_path) / 1024 ** 2:,.1f} MB Parquet")
+
+
+def refresh_parquet_cache(config_keys):
+    """Build the Parquet cache for every table whose cache is missing or stale"""
+    if pa is None:
+        logger.warning("⚠ pyarrow is not installed, Parquet cache not built")
+        return
+    for config_key in config_keys:
+        csv_path = os.path.join(DATA_DIR, TABLE_MAPPING[config_key]['file'])
+        if not os.path.exists(csv_path) or parquet_cache_fresh(config_key):
+            continue
+        try:
+            build_parquet_cache(config_key)
+        except Exception as e:
+            logger.error(f"✗ Error caching {config_key}: {e}")
+
+
+def load_parquet_cache(config_key, table_name, engine, conn, loader):
+    """Load table_name from the Parquet cache in chunk_size record batches.
+
+    Returns (rows_loaded, chunks_processed).
+    """
+    config = TABLE_MAPPING[config_key]
+    parquet_file = pq.ParquetFile(parquet_cache_path(config_key))
+
+    rows_loaded = 0
+    chunks_processed = 0
+    with tqdm(total=parquet_file.metadata.num_rows, desc=f"  Loading {table_name}") as pbar:
+        for batch in parquet_file.iter_batches(batch_size=config['chunk_size']):
+            write_record_batch(batch, table_name, loader, engine, conn)
+
+            chunks_processed += 1
+            rows_loaded += batch.num_rows
+            pbar.update(batch.num_rows)
+
+    return rows_loaded, chunks_processed
+
+
 def clean_dataframe(df, date_columns=None):
     """Clean DataFrame before loading"""
-    # Replace empty strings with None
-    df = df.replace('', None)
-    df = df.replace('nan', None)
-    
-    # Convert date columns
+    # Replace empty strings and literal 'nan' with None (text columns only;
+    # typed columns already hold NA for missing values)
+    text_columns = df.select_dtypes(include=['object', 'string']).columns
+    if len(text_columns):
+        df[text_columns] = df[text_columns].replace(['', 'nan'], None)
+
+    # Convert date columns that did not parse cleanly
     if date_columns:
         for col in date_columns:
-            if col in df.columns:
+            if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
                 df[col] = pd.to_datetime(df[col], errors='coerce')
-    
+
     return df
 
 
-def load_csv_to_table(config_key, engine, conn):
-    """Load a CSV file into its corresponding database table"""
+def restore_integer_columns(df):
+    """Cast float columns holding only whole numbers back to nullable integers.
+
+    pandas turns integer columns with missing values into float64, which
+    to_sql tolerates but COPY rejects ('123.0' is not a valid INTEGER).
+    """
+    for col in df.select_dtypes(include='float').columns:
+        values = df[col].dropna()
+        if len(values) and (values % 1 == 0).all():
+            df[col] = df[col].astype('Int64')
+    return df
+
+
+def copy_dataframe(df, table_name, conn):
+    """Stream a cleaned DataFrame into a table with COPY ... FROM STDIN"""
+    df = restore_integer_columns(df)
+
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False, date_format='%Y-%m-%d')
+    buffer.seek(0)
+
+    columns = ', '.join(df.columns)
+    cursor = conn.cursor()
+    cursor.copy_expert(f"COPY {table_name} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+    cursor.close()
+
+
+def write_chunk(chunk, table_name, loader, engine, conn):
+    """Write one cleaned chunk with the selected loader"""
+    if loader == 'copy':
+        copy_dataframe(chunk, table_name, conn)
+    else:
+        chunk.to_sql(
+            table_name,
+            engine,
+            if_exists='append',
+            index=False,
+            method='multi'
+        )
+
+
+class ByteRangeReader(io.RawIOBase):
+    """Read-only file view of a CSV header followed by one byte range of its body"""
+
+    def __init__(self, file_path, header, start, end):
+        super().__init__()
+        self.file = open(file_path, 'rb')
+        self.file.seek(start)
+        self.pending = header
+        self.remaining = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self.pending:
+            size = min(len(buffer), len(self.pending))
+            buffer[:size] = self.pending[:size]
+            self.pending = self.pending[size:]
+            return size
+
+        size = min(len(buffer), self.remaining)
+        if size <= 0:
+            return 0
+        data = self.file.read(size)
+        buffer[:len(data)] = data
+        self.remaining -= len(data)
+        return len(data)
+
+    def close(self):
+        self.file.close()
+        super().close()
+
+
+def split_byte_ranges(file_path, parts):
+    """Split a CSV body into newline-aligned (start, end) byte ranges.
+
+    Returns (header, ranges). Each boundary is moved forward to the next line
+    start, so every range holds whole rows. This assumes quoted fields never
+    contain newlines, which holds for the files configured with split_workers.
+    """
+    size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as f:
+        header = f.readline()
+        body_start = f.tell()
+
+        boundaries = [body_start]
+        for i in range(1, parts):
+            f.seek(body_start + (size - body_start) * i // parts)
+            f.readline()
+            boundary = f.tell()
+            if boundaries[-1] < boundary < size:
+                boundaries.append(boundary)
+        boundaries.append(size)
+
+    return header, list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def load_byte_range(config_key, table_name, header, start, end, loader):
+    """Parse and load one byte range of a CSV into table_name on its own connection.
+
+    Runs in a worker process. The range is committed as one transaction.
+    Returns (rows_loaded, chunks_processed, bytes_read).
+    """
     config = TABLE_MAPPING[config_key]
     file_path = os.path.join(DATA_DIR, config['file'])
-    table_name = config['table']
+
+    engine = create_sqlalchemy_engine() if loader == 'to_sql' else None
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        set_replication_role(conn, 'replica')
+
+        rows_loaded = 0
+        chunks_processed = 0
+        csv_options = csv_read_options(config_key, pd.read_csv(io.BytesIO(header), nrows=0).columns)
+        reader = io.BufferedReader(ByteRangeReader(file_path, header, start, end))
+        with reader:
+            for chunk in pd.read_csv(reader, chunksize=config['chunk_size'], low_memory=False,
+                                     encoding='utf-8', **csv_options):
+                chunk = clean_dataframe(chunk, config['date_columns'])
+                write_chunk(chunk, table_name, loader, engine, conn)
+                chunks_processed += 1
+                rows_loaded += len(chunk)
+
+        conn.commit()
+        return rows_loaded, chunks_processed, end - start
+    finally:
+        conn.close()
+        if engine is not None:
+            engine.dispose()
+
+
+def load_csv_in_ranges(config_key, table_name, workers, loader, conn):
+    """Load a large CSV by parsing newline-aligned byte ranges in parallel.
+
+    The caller truncates the table once; each worker process loads its own
+    range. If any range fails, the table is truncated again so it is never
+    left half loaded. Returns (rows_loaded, chunks_processed).
+    """
+    config = TABLE_MAPPING[config_key]
+    file_path = os.path.join(DATA_DIR, config['file'])
+    header, ranges = split_byte_ranges(file_path, workers)
+    logger.info(f"  Splitting {config['file']} into {len(ranges)} byte ranges")
+
+    rows_loaded = 0
+    chunks_processed = 0
+    error = None
+    # parallel_load calls this from worker threads; forking a threaded process can
+    # copy held locks (logging, tqdm, libpq) into the children, so they are spawned
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor, \
+            tqdm(total=os.path.getsize(file_path) - len(header), unit='B', unit_scale=True,
+                 desc=f"  Loading {table_name}") as pbar:
+        futures = [executor.submit(load_byte_range, config_key, table_name, header, start, end, loader)
+                   for start, end in ranges]
+        for future in as_completed(futures):
+            try:
+                rows, chunks, bytes_read = future.result()
+            except Exception as e:
+                error = error or e
+                continue
+            rows_loaded += rows
+            chunks_processed += chunks
+            pbar.update(bytes_read)
+
+    # All workers have finished here, so no range can commit after this TRUNCATE
+    if error is not None:
+        cursor = conn.cursor()
+        cursor.execute(f"TRUNCATE TABLE {table_name} RESTART IDENTITY CASCADE;")
+        conn.commit()
+        cursor.close()
+        raise error
+
+    return rows_loaded, chunks_processed
+
+
+def load_csv_to_table(config_key, engine, conn, loader=None, truncate=True, target_table=None):
+    """Load a CSV file into its corresponding database table (or into target_table)"""
+    config = TABLE_MAPPING[config_key]
+    file_path = os.path.join(DATA_DIR, config['file'])
+    table_name = target_table or config['table']
     chunk_size = config['chunk_size']
     date_columns = config['date_columns']
+    loader = loader or config.get('loader', 'to_sql')
+    csv_engine = config.get('engine', CSV_ENGINE)
+    if csv_engine == 'arrow' and pa is None:
+        logger.warning(f"⚠ pyarrow is not installed, parsing {config_key} with pandas")
+        csv_engine = 'pandas'
     
     if not os.path.exists(file_path):
         logger.warning(f"⚠ File not found: {file_path}")
         return False
     
     try:
-        # Get total rows for progress bar
-        total_rows = sum(1 for _ in open(file_path, encoding='utf-8')) - 1  # Subtract header
-        logger.info(f"Loading {config_key}: {total_rows:,} rows from {config['file']}")
+        # Progress is tracked in bytes so the file is only read once
+        file_size = os.path.getsize(file_path)
+        logger.info(f"Loading {config_key}: {file_size / 1024 ** 2:,.1f} MB from {config['file']}")
         
-        # Truncate table before loading (optional - remove if you want to append)
-        cursor = conn.cursor()
-        cursor.execute(f"TRUNCATE TABLE {table_name} RESTART IDENTITY CASCADE;")
-        conn.commit()
-        cursor.close()
-        logger.info(f"  Truncated table {table_name}")
+        # Truncate table before loading (skipped when the caller truncated up front)
+        if truncate:
+            cursor = conn.cursor()
+            cursor.execute(f"TRUNCATE TABLE {table_name} RESTART IDENTITY CASCADE;")
+            conn.commit()
+            cursor.close()
+            logger.info(f"  Truncated table {table_name}")
         
         # Load data in chunks
         chunks_processed = 0
         rows_loaded = 0
-        
-        with tqdm(total=total_rows, desc=f"  Loading {table_name}") as pbar:
-            for chunk in pd.read_csv(file_path, chunksize=chunk_size, low_memory=False):
-                # Clean the chunk
-                chunk = clean_dataframe(chunk, date_columns)
-                
-                # Load to database
-                chunk.to_sql(
-                    table_name,
-                    engine,
-                    if_exists='append',
-                    index=False,
-                    method='multi'
-                )
-                
-                chunks_processed += 1
-                rows_loaded += len(chunk)
-                pbar.update(len(chunk))
-        
-        logger.info(f"✓ Loaded {rows_loaded:,} rows into {table_name} ({chunks_processed} chunks)")
+        start_time = time.perf_counter()
+
+        split_workers = config.get('split_workers', 1)
+        if parquet_cache_fresh(config_key):
+            # Already typed and cleaned when the cache was built
+            csv_engine = 'parquet'
+            rows_loaded, chunks_processed = load_parquet_cache(config_key, table_name, engine, conn, loader)
+        elif csv_engine == 'arrow':
+            # Arrow already parses with multiple threads, so byte ranges are not used
+            rows_loaded, chunks_processed = load_csv_with_arrow(config_key, table_name, engine, conn, loader)
+        elif split_workers > 1:
+            rows_loaded, chunks_processed = load_csv_in_ranges(config_key, table_name, split_workers, loader, conn)
+        else:
+            # Parse types come from the schema, restricted to the columns in the header
+            csv_options = csv_read_options(config_key, pd.read_csv(file_path, nrows=0).columns)
+
+            with open(file_path, 'rb') as source, \
+                    tqdm(total=file_size, unit='B', unit_scale=True, desc=f"  Loading {table_name}") as pbar:
+                for chunk in pd.read_csv(source, chunksize=chunk_size, low_memory=False, encoding='utf-8',
+                                         **csv_options):
+                    # Clean the chunk
+                    chunk = clean_dataframe(chunk, date_columns)
+
+                    # Load to database
+                    write_chunk(chunk, table_name, loader, engine, conn)
+
+                    chunks_processed += 1
+                    rows_loaded += len(chunk)
+                    # The parser reads ahead, so this runs slightly ahead of the rows written
+                    pbar.update(source.tell() - pbar.n)
+
+        # COPY chunks share one transaction so a failed file leaves the table empty
+        if loader == 'copy':
+            conn.commit()
+
+        elapsed = time.perf_counter() - start_time
+        rate = rows_loaded / elapsed if elapsed > 0 else 0
+        logger.info(f"✓ Loaded {rows_loaded:,} rows into {table_name} ({chunks_processed} chunks, "
+                    f"{elapsed:.1f}s, {rate:,.0f} rows/s via {csv_engine} + {loader})")
         return True
-        
+
     except Exception as e:
+        conn.rollback()
         logger.error(f"✗ Error loading {config_key}: {e}")
         return False
 
 
+def can_merge(conn, config_key):
+    """Whether a changed source can be merged into its table instead of reloaded.
+
+    Needs a 'merge_key' and a populated table; an empty table (first load,
+    or emptied by a parent's TRUNCATE ... CASCADE) is simply loaded.
+    """
+    if 'merge_key' not in TABLE_MAPPING[config_key]:
+        return False
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {TABLE_MAPPING[config_key]['table']});")
+    has_rows = cursor.fetchone()[0]
+    cursor.close()
+    conn.commit()
+    return has_rows
+
+
+def merge_csv_into_table(config_key, engine, conn):
+    """Apply a changed source file to its table as deletes, updates and inserts on merge_key.
+
+    Append-mostly sources such as the market value history change a little
+    on every refresh, so a TRUNCATE and full reload would rewrite the whole
+    table and its indexes each time. The file is still parsed once, into a
+    temp table, but only the differences reach the table, in one
+    transaction: rows whose key left the file are deleted, rows whose other
+    columns changed are updated (one file row per key) and new keys are
+    inserted. Rows with a NULL key column never match, so they are replaced
+    on every merge.
+    """
+    config = TABLE_MAPPING[config_key]
+    table_name = config['table']
+    file_path = os.path.join(DATA_DIR, config['file'])
+    key = config['merge_key']
+    incoming = f"{table_name}_incoming"
+    cursor = conn.cursor()
+    try:
+        start_time = time.perf_counter()
+        cursor.execute(f"DROP TABLE IF EXISTS {incoming};")
+        cursor.execute(f"CREATE TEMP TABLE {incoming} AS SELECT * FROM {table_name} WITH NO DATA;")
+        conn.commit()
+        if not load_csv_to_table(config_key, engine, conn, loader='copy', truncate=False, target_table=incoming):
+            raise RuntimeError(f"load into {incoming} failed")
+
+        table_columns = parse_schema_columns()[table_name]
+        columns = [column for column in pd.read_csv(file_path, nrows=0).columns if column in table_columns]
+        serial_columns = {column for column, _ in serial_sequences(conn, table_name)}
+        value_columns = [column for column in columns if column not in key and column not in serial_columns]
+        key_match = ' AND '.join(f"t.{column} = i.{column}" for column in key)
+        column_list = ', '.join(columns)
+
+        cursor.execute(f"DELETE FROM {table_name} t WHERE NOT EXISTS (SELECT 1 FROM {incoming} i WHERE {key_match});")
+        deleted = cursor.rowcount
+        updated = 0
+        if value_columns:
+            cursor.execute(f"""
+                UPDATE {table_name} t
+                SET {', '.join(f'{column} = i.{column}' for column in value_columns)}
+                FROM (
+                    SELECT DISTINCT ON ({', '.join(key)}) * FROM {incoming}
+                    ORDER BY {', '.join(key)}
+                ) i
+                WHERE {key_match}
+                  AND ({', '.join(f't.{column}' for column in value_columns)})
+                      IS DISTINCT FROM ({', '.join(f'i.{column}' for column in value_columns)});
+            """)
+            updated = cursor.rowcount
+        cursor.execute(f"""
+            INSERT INTO {table_name} ({column_list})
+            SELECT {column_list} FROM {incoming} i
+            WHERE NOT EXISTS (SELECT 1 FROM {table_name} t WHERE {key_match});
+        """)
+        inserted = cursor.rowcount
+        conn.commit()
+        logger.info(f"✓ Merged {config['file']} into {table_name}: {inserted:,} inserted, "
+                    f"{updated:,} updated, {deleted:,} deleted ({time.perf_counter() - start_time:.1f}s)")
+        return True
+
+    except Exception as e:
+        conn.rollback()
+        logger.error(f"✗ Merge of {config_key} failed, {table_name} left unchanged: {e}")
+        return False
+    finally:
+        cursor.execute(f"DROP TABLE IF EXISTS {incoming};")
+        conn.commit()
+        cursor.close()
+
+
+def get_index_definitions(conn, table_name):
+    """Indexes of a table as (index_name, indexdef, constraint_name, constraint_type).
+
+    constraint_name/constraint_type are set for indexes that back a PRIMARY
+    KEY ('p') or UNIQUE ('u') constraint and None for plain indexes.
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT i.indexname, i.indexdef, c.conname, c.contype
+        FROM pg_indexes i
+        LEFT JOIN pg_constraint c
+               ON c.conrelid = %(table)s::regclass
+              AND c.contype IN ('p', 'u')
+              AND c.conindid = (quote_ident(i.schemaname) || '.' || quote_ident(i.indexname))::regclass
+        WHERE i.schemaname = current_schema() AND i.tablename = %(table)s
+        ORDER BY i.indexname;
+    """, {'table': table_name})
+    indexes = cursor.fetchall()
+    cursor.close()
+    return indexes
+
+
+def serial_sequences(conn, table_name):
+    """(column, sequence) pairs for the SERIAL columns of a table"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT attname, pg_get_serial_sequence(%(table)s, attname)
+        FROM pg_attribute
+        WHERE attrelid = %(table)s::regclass AND attnum > 0 AND NOT attisdropped
+          AND pg_get_serial_sequence(%(table)s, attname) IS NOT NULL;
+    """, {'table': table_name})
+    sequences = cursor.fetchall()
+    cursor.close()
+    return sequences
+
+
+def staging_name(name):
+    """Temporary name for a staging object, kept under the 63 character identifier limit"""
+    return name[:59] + '_stg'
+
+
+def staging_sequence(sequence):
+    """Schema-qualified name of the staging copy of a (schema-qualified) sequence"""
+    schema, _, name = sequence.rpartition('.')
+    return f"{schema}.{staging_name(name)}" if schema else staging_name(name)
+
+
+def build_staging_indexes(conn, staging_table, indexes):
+    """Recreate a table's indexes and PK/UNIQUE constraints on its staging copy"""
+    cursor = conn.cursor()
+    for index_name, indexdef, constraint_name, constraint_type in indexes:
+        start_time = time.perf_counter()
+        indexdef = re.sub(r'^(CREATE (?:UNIQUE )?INDEX )\S+ ON (?:ONLY )?\S+ ',
+                          rf'\g<1>{staging_name(index_name)} ON {staging_table} ', indexdef)
+        cursor.execute(indexdef)
+        if constraint_name:
+            kind = 'PRIMARY KEY' if constraint_type == 'p' else 'UNIQUE'
+            cursor.execute(f"ALTER TABLE {staging_table} ADD CONSTRAINT {staging_name(constraint_name)} "
+                           f"{kind} USING INDEX {staging_name(index_name)};")
+        conn.commit()
+        logger.info(f"  Built {index_name} in {time.perf_counter() - start_time:.1f}s")
+    cursor.close()
+
+
+def swap_staging_table(conn, table_name, staging_table, indexes):
+    """Replace a live table by its staging copy in one short transaction.
+
+    Locks are always taken parent first: the tables the copy references,
+    then the table itself, then the tables that reference it. Concurrent
+    swaps of a parent and its children therefore queue instead of
+    deadlocking. Foreign keys that reference the live table are read under
+    the lock and re-created NOT VALID against the new table, the same
+    guarantee a replica-mode load gives. The staging copy's own sequences
+    replace the live ones, which are dropped with the old table.
+    """
+    old_table = f"{table_name}_old"
+    cursor = conn.cursor()
+    cursor.execute("SET LOCAL lock_timeout = '30s';")
+    cursor.execute("""
+        SELECT DISTINCT confrelid::regclass::text
+        FROM pg_constraint
+        WHERE contype = 'f' AND conrelid = %(staging)s::regclass AND confrelid <> %(staging)s::regclass
+        ORDER BY 1;
+    """, {'staging': staging_table})
+    for (parent_table,) in cursor.fetchall():
+        cursor.execute(f"LOCK TABLE {parent_table} IN SHARE ROW EXCLUSIVE MODE;")
+    cursor.execute(f"LOCK TABLE {table_name} IN ACCESS EXCLUSIVE MODE;")
+
+    cursor.execute("""
+        SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid)
+        FROM pg_constraint
+        WHERE contype = 'f' AND confrelid = %(table)s::regclass AND conrelid <> %(table)s::regclass
+        ORDER BY 1, 2;
+    """, {'table': table_name})
+    referencing_keys = cursor.fetchall()
+    for child_table in sorted({key[0] for key in referencing_keys}):
+        cursor.execute(f"LOCK TABLE {child_table} IN SHARE ROW EXCLUSIVE MODE;")
+    cursor.execute("SELECT obj_description(%s::regclass, 'pg_class');", (table_name,))
+    comment = cursor.fetchone()[0]
+    sequences = serial_sequences(conn, table_name)
+
+    cursor.execute(f"ALTER TABLE {table_name} RENAME TO {old_table};")
+    cursor.execute(f"ALTER TABLE {staging_table} RENAME TO {table_name};")
+    # The live sequences are owned by the old table and go with it
+    cursor.execute(f"DROP TABLE {old_table} CASCADE;")
+    for _, sequence in sequences:
+        cursor.execute(f"ALTER SEQUENCE {staging_sequence(sequence)} "
+                       f"RENAME TO {sequence.rpartition('.')[2]};")
+
+    for index_name, _, constraint_name, _ in indexes:
+        if constraint_name:
+            cursor.execute(f"ALTER TABLE {table_name} RENAME CONSTRAINT "
+                           f"{staging_name(constraint_name)} TO {constraint_name};")
+        else:
+            cursor.execute(f"ALTER INDEX {staging_name(index_name)} RENAME TO {index_name};")
+    for referencing_table, constraint_name, definition in referencing_keys:
+        definition = re.sub(r'\s+NOT VALID$', '', definition)
+        cursor.execute(f"ALTER TABLE {referencing_table} ADD CONSTRAINT {constraint_name} "
+                       f"{definition} NOT VALID;")
+    if comment:
+        cursor.execute(f"COMMENT ON TABLE {table_name} IS %s;", (comment,))
+
+    conn.commit()
+    cursor.close()
+
+
+def load_table_via_staging(config_key, engine, conn, loader=None):
+    """Load a table into a shadow copy and swap it in atomically.
+
+    The live table keeps serving its previous contents for the whole load.
+    The copy is filled UNLOGGED, then switched to LOGGED (a full rewrite
+    that writes the table to WAL once, unless wal_level is minimal),
+    indexed, given the live table's foreign keys (NOT VALID) and renamed
+    into place. It numbers its SERIAL columns from its own sequences, so
+    the live sequences are not touched while the live table is in use. On
+    failure the copy is dropped and the live table is left untouched.
+    """
+    table_name = TABLE_MAPPING[config_key]['table']
+    staging_table = f"{table_name}_staging"
+    cursor = conn.cursor()
+    try:
+        indexes = get_index_definitions(conn, table_name)
+        cursor.execute("""
+            SELECT conname, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE contype = 'f' AND conrelid = %s::regclass;
+        """, (table_name,))
+        foreign_keys = cursor.fetchall()
+
+        cursor.execute(f"DROP TABLE IF EXISTS {staging_table};")
+        cursor.execute(f"CREATE UNLOGGED TABLE {staging_table} "
+                       f"(LIKE {table_name} INCLUDING DEFAULTS INCLUDING CONSTRAINTS);")
+        # The staging copy numbers its rows from 1, like TRUNCATE ... RESTART IDENTITY,
+        # from sequences of its own so the live table keeps using its sequences
+        for column, sequence in serial_sequences(conn, table_name):
+            cursor.execute("SELECT format_type(seqtypid, NULL) FROM pg_sequence WHERE seqrelid = %s::regclass;",
+                           (sequence,))
+            sequence_type = cursor.fetchone()[0]
+            cursor.execute(f"DROP SEQUENCE IF EXISTS {staging_sequence(sequence)};")
+            cursor.execute(f"CREATE SEQUENCE {staging_sequence(sequence)} AS {sequence_type} "
+                           f"OWNED BY {staging_table}.{column};")
+            cursor.execute(f"ALTER TABLE {staging_table} ALTER COLUMN {column} "
+                           f"SET DEFAULT nextval(%s::regclass);", (staging_sequence(sequence),))
+        conn.commit()
+        logger.info(f"  Created staging table {staging_table}")
+
+        if not load_csv_to_table(config_key, engine, conn, loader=loader, truncate=False,
+                                 target_table=staging_table):
+            raise RuntimeError(f"load into {staging_table} failed")
+
+        start_time = time.perf_counter()
+        # Permanent child tables cannot reference an unlogged table. This rewrites
+        # the copy into WAL, so the WAL volume is logged rather than assumed away.
+        cursor.execute("SELECT pg_current_wal_lsn();")
+        wal_start = cursor.fetchone()[0]
+        cursor.execute(f"ALTER TABLE {staging_table} SET LOGGED;")
+        conn.commit()
+        cursor.execute("SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), %s);", (wal_start,))
+        wal_bytes = cursor.fetchone()[0]
+        conn.commit()
+        logger.info(f"  Set {staging_table} logged in {time.perf_counter() - start_time:.1f}s "
+                    f"({float(wal_bytes) / 1024 ** 2:,.1f} MB of WAL)")
+
+        build_staging_indexes(conn, staging_table, indexes)
+        for constraint_name, definition in foreign_keys:
+            definition = re.sub(r'\s+NOT VALID$', '', definition)
+            cursor.execute(f"ALTER TABLE {staging_table} ADD CONSTRAINT {constraint_name} "
+                           f"{definition} NOT VALID;")
+        conn.commit()
+
+        start_time = time.perf_counter()
+        swap_staging_table(conn, table_name, staging_table, indexes)
+        logger.info(f"✓ Swapped {staging_table} into {table_name} in {time.perf_counter() - start_time:.2f}s")
+        return True
+
+    except Exception as e:
+        conn.rollback()
+        logger.error(f"✗ Staging load of {config_key} failed, {table_name} left unchanged: {e}")
+        try:
+            cursor.execute(f"DROP TABLE IF EXISTS {staging_table};")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+        return False
+    finally:
+        cursor.close()
+
+
+def drop_secondary_indexes(conn, config_keys):
+    """Drop every index that does not back a PK/UNIQUE constraint on the target tables.
+
+    Returns {table_name: [(index_name, indexdef), ...]} for rebuild_indexes.
+    The definitions are also logged so they can be recreated by hand if the
+    process dies before the rebuild.
+    """
+    dropped = {}
+    cursor = conn.cursor()
+    for config_key in config_keys:
+        table_name = TABLE_MAPPING[config_key]['table']
+        indexes = [(index_name, indexdef)
+                   for index_name, indexdef, constraint_name, _ in get_index_definitions(conn, table_name)
+                   if constraint_name is None]
+        for index_name, indexdef in indexes:
+            logger.info(f"  Dropping {indexdef}")
+            cursor.execute(f"DROP INDEX IF EXISTS {index_name};")
+        if indexes:
+            dropped[table_name] = indexes
+    conn.commit()
+    cursor.close()
+    logger.info(f"✓ Dropped {sum(len(i) for i in dropped.values())} secondary indexes "
+                f"on {len(dropped)} tables\n")
+    return dropped
+
+
+def rebuild_table_indexes(table_name, indexes):
+    """Recreate one table's indexes on its own connection, returning (index, table, seconds)"""
+    timings = []
+    conn = create_connection()
+    try:
+        cursor = conn.cursor()
+        for index_name, indexdef in indexes:
+            start_time = time.perf_counter()
+            cursor.execute(indexdef.replace('CREATE INDEX', 'CREATE INDEX IF NOT EXISTS', 1)
+                                   .replace('CREATE UNIQUE INDEX', 'CREATE UNIQUE INDEX IF NOT EXISTS', 1))
+            conn.commit()
+            timings.append((index_name, table_name, time.perf_counter() - start_time))
+        cursor.close()
+    finally:
+        conn.close()
+    return timings
+
+
+def rebuild_indexes(dropped, workers):
+    """Rebuild dropped indexes, one table per worker so tables are indexed concurrently"""
+    if not dropped:
+        return []
+    logger.info("\n" + "="*60)
+    logger.info("REBUILDING INDEXES")
+    logger.info("="*60)
+
+    start_time = time.perf_counter()
+    timings = []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(dropped)))) as executor:
+        futures = {executor.submit(rebuild_table_indexes, table_name, indexes): table_name
+                   for table_name, indexes in dropped.items()}
+        for future in as_completed(futures):
+            try:
+                table_timings = future.result()
+            except Exception as e:
+                logger.error(f"✗ Failed to rebuild indexes on {futures[future]}: {e}")
+                continue
+            for index_name, table_name, elapsed in table_timings:
+                logger.info(f"✓ {index_name} on {table_name}: {elapsed:.1f}s")
+            timings.extend(table_timings)
+
+    logger.info(f"Rebuilt {len(timings)} indexes in {time.perf_counter() - start_time:.1f}s")
+    return timings
+
+
+def set_replication_role(conn, role):
+    """Switch FK trigger enforcement for the session ('replica' disables it)"""
+    cursor = conn.cursor()
+    cursor.execute(f"SET session_replication_role = '{role}';")
+    conn.commit()
+    cursor.close()
+
+
+def with_dependents(config_keys):
+    """Add every table whose 'depends_on' chain reaches one of config_keys.
+
+    TRUNCATE ... CASCADE on a parent empties its dependents, so reloading a
+    parent means reloading everything below it in the dependency graph.
+    """
+    selected = list(config_keys)
+    added = True
+    while added:
+        added = False
+        for config_key, config in TABLE_MAPPING.items():
+            if config_key not in selected and set(config.get('depends_on', [])) & set(selected):
+                selected.append(config_key)
+                added = True
+    return selected
+
+
+def dependency_levels(config_keys):
+    """Group config_keys into levels so each table comes after the tables it depends on.
+
+    Only 'depends_on' edges between the given keys count. Tables in one
+    level do not depend on each other.
+    """
+    remaining = list(config_keys)
+    levels = []
+    while remaining:
+        level = [key for key in remaining
+                 if not set(TABLE_MAPPING[key].get('depends_on', [])) & (set(remaining) - {key})]
+        if not level:
+            # A cycle cannot be ordered; load the rest together
+            level = remaining
+        levels.append(level)
+        remaining = [key for key in remaining if key not in level]
+    return levels
+
+
+def truncate_tables(conn, config_keys):
+    """Truncate all target tables in a single statement"""
+    table_names = ', '.join(TABLE_MAPPING[key]['table'] for key in config_keys)
+    cursor = conn.cursor()
+    cursor.execute(f"TRUNCATE TABLE {table_names} RESTART IDENTITY CASCADE;")
+    conn.commit()
+    cursor.close()
+    logger.info(f"  Truncated {len(config_keys)} tables")
+
+
+def source_size(config_key):
+    """Size in bytes of a table's source file (0 when missing)"""
+    file_path = os.path.join(DATA_DIR, TABLE_MAPPING[config_key]['file'])
+    return os.path.getsize(file_path) if os.path.exists(file_path) else 0
+
+
+def load_table_worker(config_key, staging=False, merge=False):
+    """Load (or with merge=True, merge) one table on its own connection and replica-mode session"""
+    start_time = time.perf_counter()
+    engine = create_sqlalchemy_engine()
+    try:
+        conn = create_connection()
+    except Exception:
+        engine.dispose()
+        return config_key, False, time.perf_counter() - start_time
+
+    try:
+        set_replication_role(conn, 'replica')
+        if staging:
+            success = load_table_via_staging(config_key, engine, conn)
+        elif merge:
+            success = merge_csv_into_table(config_key, engine, conn)
+        else:
+            success = load_csv_to_table(config_key, engine, conn, truncate=False)
+    except Exception as e:
+        logger.error(f"✗ Worker failed on {config_key}: {e}")
+        success = False
+    finally:
+        conn.close()
+        engine.dispose()
+
+    return config_key, success, time.perf_counter() - start_time
+
+
+def parallel_load(conn, config_keys, workers, staging=False):
+    """Load tables concurrently on a bounded thread pool.
+
+    Every target is truncated up front in one statement, which removes the
+    only ordering constraint the dependency graph imposes (a parent's
+    TRUNCATE ... CASCADE wiping an already loaded child). With FK triggers
+    off in replica mode, every table is then ready at once and is queued
+    largest file first, so the longest loads start immediately. Populated
+    tables with a merge_key whose parents are not reloaded are merged
+    instead, and left out of the truncate.
+
+    With staging=True nothing is truncated: each table is loaded into its
+    own shadow copy and swapped in, so dependents keep their rows. A
+    parent's swap re-creates its children's foreign keys and a child's
+    staging copy references the parent, so staged tables run in dependency
+    levels: a parent is swapped in before its children start.
+
+    Returns a list of (config_key, success, seconds) in completion order.
+    """
+    merging = set()
+    if staging:
+        levels = dependency_levels(config_keys)
+    else:
+        config_keys = with_dependents(config_keys)
+        merging = {key for key in config_keys
+                   if not set(TABLE_MAPPING[key].get('depends_on', [])) & set(config_keys)
+                   and can_merge(conn, key)}
+        truncated = [key for key in config_keys if key not in merging]
+        if truncated:
+            truncate_tables(conn, truncated)
+        levels = [config_keys]
+
+    results = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for level in levels:
+            schedule = sorted(level, key=source_size, reverse=True)
+            logger.info(f"Parallel load with {workers} workers, schedule: {', '.join(schedule)}")
+            futures = [executor.submit(load_table_worker, config_key, staging, config_key in merging)
+                       for config_key in schedule]
+            for future in as_completed(futures):
+                config_key, success, elapsed = future.result()
+                status = "✓" if success else "✗"
+                logger.info(f"{status} {config_key} finished in {elapsed:.1f}s")
+                results.append((config_key, success, elapsed))
+
+    return results
+
+
+# (path, size, mtime) -> SHA-256 of every file hashed during this run
+_file_hashes = {}
+
+
+def compute_file_hash(file_path):
+    """SHA-256 of a file, read in 1 MB blocks (at most once per run per file version)"""
+    stat = os.stat(file_path)
+    key = (file_path, stat.st_size, stat.st_mtime)
+    if key not in _file_hashes:
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        _file_hashes[key] = digest.hexdigest()
+    return _file_hashes[key]
+
+
+def known_file_hash(file_path):
+    """SHA-256 of a file if it was already hashed this run, else None (never reads the file)"""
+    stat = os.stat(file_path)
+    return _file_hashes.get((file_path, stat.st_size, stat.st_mtime))
+
+
+def load_manifest():
+    """Read the load manifest (empty when no load has been recorded yet)"""
+    if os.path.exists(MANIFEST_FILE):
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def save_manifest(manifest):
+    """Persist the load manifest"""
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+
+def source_unchanged(config_key, manifest, conn):
+    """Check whether a table's source file matches its manifest entry.
+
+    Size and mtime are the fast check; the content hash is only computed
+    when the size matches but the mtime moved, so a touched but identical
+    file is still skipped. An entry recorded without a hash (the file was
+    not hashed during that run) cannot confirm a touched file, so the table
+    is reloaded and the hash recorded. A table that is empty in the
+    database is never considered unchanged.
+    """
+    entry = manifest.get(config_key)
+    file_path = os.path.join(DATA_DIR, TABLE_MAPPING[config_key]['file'])
+    if entry is None or not os.path.exists(file_path):
+        return False
+
+    stat = os.stat(file_path)
+    if stat.st_size != entry['size']:
+        return False
+    if stat.st_mtime != entry['mtime']:
+        # Also computed when the entry has no hash, so the reload can record it
+        if compute_file_hash(file_path) != entry.get('sha256'):
+            return False
+        entry['mtime'] = stat.st_mtime
+
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {TABLE_MAPPING[config_key]['table']});")
+    has_rows = cursor.fetchone()[0]
+    cursor.close()
+    return has_rows
+
+
+def record_load(manifest, config_key, seconds):
+    """Store the fingerprint of a successfully loaded source file
+
+    The hash is only stored when source_unchanged already computed it this
+    run; a freshly loaded file is not read a second time just to hash it.
+    """
+    file_path = os.path.join(DATA_DIR, TABLE_MAPPING[config_key]['file'])
+    stat = os.stat(file_path)
+    manifest[config_key] = {
+        'file': TABLE_MAPPING[config_key]['file'],
+        'size': stat.st_size,
+        'mtime': stat.st_mtime,
+        'sha256': known_file_hash(file_path),
+        'seconds': round(seconds, 2),
+        'loaded_at': datetime.now().isoformat()
+    }
+
+
 def verify_data_load(conn):
     """Verify data has been loaded correctly"""
     logger.info("\n" + "="*60)
@@ -243,8 +1332,28 @@ def verify_data_load(conn):
     cursor.close()
 
 
-def main():
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Load Data/ CSV files into PostgreSQL")
+    parser.add_argument('--workers', type=int, default=int(os.getenv('LOAD_WORKERS', '1')),
+                        help="tables loaded concurrently (1 = sequential, default from LOAD_WORKERS)")
+    parser.add_argument('--build-parquet', action='store_true',
+                        help="refresh the Parquet cache next to each CSV before loading")
+    parser.add_argument('--force', action='store_true',
+                        help="reload every table even if its source file is unchanged")
+    parser.add_argument('--staging', action='store_true',
+                        help="load into UNLOGGED shadow tables and swap them in atomically")
+    parser.add_argument('--manage-indexes', action='store_true',
+                        help="drop secondary indexes before loading and rebuild them afterwards")
+    parser.add_argument('--index-workers', type=int, default=int(os.getenv('INDEX_WORKERS', '4')),
+                        help="tables re-indexed concurrently after a --manage-indexes load")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main ETL process"""
+    args = parse_args(argv)
+
     logger.info("="*60)
     logger.info("FOOTBALL DATA ETL - LOADING PROCESS STARTED")
     logger.info("="*60)
@@ -292,15 +1401,69 @@ def main():
     logger.info("STARTING DATA LOAD")
     logger.info("="*60 + "\n")
     
+    if args.build_parquet:
+        refresh_parquet_cache(load_order)
+
+    # Skip tables whose source file is unchanged since the last successful load
+    manifest = load_manifest()
+    if args.force:
+        changed = load_order
+    else:
+        changed = [key for key in load_order if not source_unchanged(key, manifest, conn)]
+    # A staged swap never truncates, so dependents of a reloaded table keep their rows
+    reload = changed if args.staging else with_dependents(changed)
+    tables_to_load = [key for key in load_order if key in reload]
+    skipped = [key for key in load_order if key not in tables_to_load]
+
+    if skipped:
+        saved = sum(manifest[key].get('seconds', 0) for key in skipped)
+        logger.info(f"⏭  Skipping {len(skipped)} unchanged tables (~{saved:.0f}s saved, use --force to reload):")
+        for config_key in skipped:
+            logger.info(f"  - {config_key} (last loaded {manifest[config_key]['loaded_at']})")
+        logger.info("")
+
     success_count = 0
     failed_count = 0
-    
-    for config_key in load_order:
-        if load_csv_to_table(config_key, engine, conn):
-            success_count += 1
+
+    # Staging loads build indexes on the shadow table already
+    dropped_indexes = {}
+    if args.manage_indexes and tables_to_load and not args.staging:
+        dropped_indexes = drop_secondary_indexes(conn, tables_to_load)
+
+    try:
+        if not tables_to_load:
+            logger.info("Nothing to load")
+        elif args.workers > 1:
+            for config_key, success, elapsed in parallel_load(conn, tables_to_load, args.workers, args.staging):
+                if success:
+                    success_count += 1
+                    record_load(manifest, config_key, elapsed)
+                else:
+                    failed_count += 1
+                    manifest.pop(config_key, None)
+            logger.info("")
         else:
-            failed_count += 1
-        logger.info("")  # Empty line for readability
+            for config_key in tables_to_load:
+                start_time = time.perf_counter()
+                if args.staging:
+                    success = load_table_via_staging(config_key, engine, conn)
+                elif can_merge(conn, config_key):
+                    # Parents are loaded first; a reloaded parent's CASCADE has emptied this table
+                    success = merge_csv_into_table(config_key, engine, conn)
+                else:
+                    success = load_csv_to_table(config_key, engine, conn)
+                if success:
+                    success_count += 1
+                    record_load(manifest, config_key, time.perf_counter() - start_time)
+                else:
+                    failed_count += 1
+                    manifest.pop(config_key, None)
+                logger.info("")  # Empty line for readability
+    finally:
+        # Rebuilt even when a load fails so the tables are never left unindexed
+        rebuild_indexes(dropped_indexes, args.index_workers)
+
+    save_manifest(manifest)
     
     # Verify data load
     verify_data_load(conn)
@@ -326,6 +1489,7 @@ def main():
     logger.info("="*60)
     logger.info(f"End Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     logger.info(f"Tables loaded successfully: {success_count}")
+    logger.info(f"Tables skipped (unchanged): {len(skipped)}")
     logger.info(f"Tables failed: {failed_count}")
     logger.info("="*60 + "\n")
 
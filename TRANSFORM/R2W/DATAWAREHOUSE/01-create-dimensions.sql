@@ -88,6 +88,7 @@ CREATE TABLE dw.dim_team (
     primary_competition_id VARCHAR(50), -- Main competition
     division_level VARCHAR(100),
     is_active BOOLEAN DEFAULT TRUE,
+    is_inferred BOOLEAN DEFAULT FALSE, -- TRUE if only known from a fact source; load_dim_team enriches it
     load_datetime TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -212,6 +213,47 @@ CREATE TABLE dw.dim_injury_type (
 
 COMMENT ON TABLE dw.dim_injury_type IS 'Classification of injury types';
 
+-- ============================================================
+-- Injury classification rules
+-- Keyword rules that classify injury_reason values; the first matching
+-- rule by priority wins, unmatched reasons fall back to 'Other'/'Low'.
+-- Edit the rules and re-run load_dimensions.py to reclassify.
+-- ============================================================
+CREATE TABLE dw.injury_classification_rule (
+    rule_id SERIAL PRIMARY KEY,
+    keyword VARCHAR(100) NOT NULL UNIQUE, -- case-insensitive substring of injury_reason
+    injury_category VARCHAR(100) NOT NULL,
+    injury_severity VARCHAR(50),
+    priority INTEGER NOT NULL -- lower value wins when several keywords match
+);
+
+COMMENT ON TABLE dw.injury_classification_rule IS 'Editable keyword rules for classifying injury reasons';
+
+INSERT INTO dw.injury_classification_rule (keyword, injury_category, injury_severity, priority) VALUES
+('muscle', 'Muscular', 'Medium', 1),
+('strain', 'Muscular', 'Medium', 1),
+('tear', 'Muscular', 'Medium', 1),
+('fracture', 'Bone/Ligament', 'High', 2),
+('break', 'Bone/Ligament', 'High', 2),
+('rupture', 'Bone/Ligament', 'High', 2),
+('ankle', 'Joint', 'Medium', 3),
+('knee', 'Joint', 'Medium', 3),
+('hip', 'Joint', 'Medium', 3);
+
+-- ============================================================
+-- Injury reason map
+-- Materialized injury_reason -> injury_type_sk classification,
+-- joined directly by the injury fact load
+-- ============================================================
+CREATE TABLE dw.injury_reason_map (
+    injury_reason TEXT PRIMARY KEY,
+    injury_type_sk INTEGER NOT NULL REFERENCES dw.dim_injury_type(injury_type_sk),
+    rule_id INTEGER REFERENCES dw.injury_classification_rule(rule_id) ON DELETE SET NULL, -- NULL for the fallback
+    load_datetime TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE dw.injury_reason_map IS 'Classification of each source injury_reason into dim_injury_type';
+
 -- ============================================================
 -- DIMENSION: Transfer Type
 -- Reference dimension for transfer classifications
@@ -6,15 +6,18 @@
 -- ============================================================
 -- FACT: Player Performance
 -- Grain: One record per player performance entry (season/competition/team combination)
+-- LIST-partitioned by season_sk: one partition per season
+-- (dw.fact_player_performance_s<season_sk>, created by load_facts.py)
+-- plus a default partition
 -- ============================================================
 CREATE TABLE dw.fact_player_performance (
-    performance_sk BIGSERIAL PRIMARY KEY,
+    performance_sk BIGSERIAL,
     
     -- Dimension foreign keys
     player_sk BIGINT NOT NULL REFERENCES dw.dim_player(player_sk),
     team_sk INTEGER REFERENCES dw.dim_team(team_sk),
     competition_sk INTEGER REFERENCES dw.dim_competition(competition_sk),
-    season_sk INTEGER REFERENCES dw.dim_season(season_sk),
+    season_sk INTEGER NOT NULL REFERENCES dw.dim_season(season_sk), -- Partition key
     
     -- Degenerate dimensions (if no date available)
     season_name VARCHAR(10),
@@ -47,16 +50,19 @@ CREATE TABLE dw.fact_player_performance (
     source_record_id VARCHAR(100),
     load_datetime TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     
-    -- Partitioning hint: partition by season_name or year
+    -- The partition key must be part of the primary key
+    PRIMARY KEY (performance_sk, season_sk),
     CONSTRAINT check_goals_positive CHECK (goals >= 0),
     CONSTRAINT check_assists_positive CHECK (assists >= 0)
-);
+) PARTITION BY LIST (season_sk);
 
--- Indexes for common queries
+CREATE TABLE dw.fact_player_performance_default
+    PARTITION OF dw.fact_player_performance DEFAULT;
+
+-- Indexes for common queries (created on every partition; season filters use partition pruning)
 CREATE INDEX idx_fact_performance_player ON dw.fact_player_performance(player_sk);
 CREATE INDEX idx_fact_performance_team ON dw.fact_player_performance(team_sk);
 CREATE INDEX idx_fact_performance_competition ON dw.fact_player_performance(competition_sk);
-CREATE INDEX idx_fact_performance_season ON dw.fact_player_performance(season_sk);
 CREATE INDEX idx_fact_performance_season_name ON dw.fact_player_performance(season_name);
 CREATE INDEX idx_fact_performance_composite ON dw.fact_player_performance(player_sk, season_sk, team_sk);
 
@@ -77,7 +83,7 @@ CREATE TABLE dw.fact_market_value (
     market_value DECIMAL(15,2) NOT NULL,
     
     -- Classification
-    is_latest_value BOOLEAN DEFAULT FALSE, -- TRUE if from player_latest_market_value table
+    is_latest_value BOOLEAN DEFAULT FALSE, -- TRUE on each player's most recent valuation
     value_source VARCHAR(50), -- 'historical' or 'latest'
     
     -- Value change tracking (can be calculated)
@@ -96,7 +102,9 @@ CREATE TABLE dw.fact_market_value (
 -- Indexes
 CREATE INDEX idx_fact_market_value_player ON dw.fact_market_value(player_sk);
 CREATE INDEX idx_fact_market_value_date ON dw.fact_market_value(date_sk);
-CREATE INDEX idx_fact_market_value_latest ON dw.fact_market_value(player_sk, is_latest_value);
+-- Partial: only the one latest row per player, covering "current value" lookups
+CREATE INDEX idx_fact_market_value_latest ON dw.fact_market_value(player_sk)
+    INCLUDE (market_value) WHERE is_latest_value;
 CREATE INDEX idx_fact_market_value_composite ON dw.fact_market_value(player_sk, date_sk);
 
 COMMENT ON TABLE dw.fact_market_value IS 'Historical and current player market values';
@@ -228,7 +236,8 @@ COMMENT ON TABLE dw.fact_national_performance IS 'Player performance for nationa
 
 -- ============================================================
 -- FACT: Teammate Relationship
--- Grain: One record per player-teammate pair
+-- Grain: One record per unordered player pair (player_sk < teammate_player_sk);
+-- dw.v_teammate_relationship_directional lists each pair from both sides
 -- ============================================================
 CREATE TABLE dw.fact_teammate_relationship (
     teammate_fact_sk BIGSERIAL PRIMARY KEY,
@@ -250,16 +259,30 @@ CREATE TABLE dw.fact_teammate_relationship (
     load_datetime TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     
     CONSTRAINT check_minutes_positive CHECK (minutes_played_together >= 0),
-    CONSTRAINT check_different_players CHECK (player_sk != teammate_player_sk),
+    CONSTRAINT check_canonical_pair CHECK (player_sk < teammate_player_sk),
     UNIQUE(player_sk, teammate_player_sk)
 );
 
--- Indexes
-CREATE INDEX idx_fact_teammate_player ON dw.fact_teammate_relationship(player_sk);
+-- Indexes (the UNIQUE index already covers lookups by player_sk)
 CREATE INDEX idx_fact_teammate_teammate ON dw.fact_teammate_relationship(teammate_player_sk);
-CREATE INDEX idx_fact_teammate_composite ON dw.fact_teammate_relationship(player_sk, teammate_player_sk);
 
-COMMENT ON TABLE dw.fact_teammate_relationship IS 'Player-teammate relationship metrics';
+COMMENT ON TABLE dw.fact_teammate_relationship IS 'Player-teammate relationship metrics, one row per pair';
+
+-- Both directions of every pair, for "teammates of player X" queries
+CREATE VIEW dw.v_teammate_relationship_directional AS
+SELECT 
+    teammate_fact_sk, player_sk, teammate_player_sk,
+    minutes_played_together, ppg_played_with, joint_goal_participation, chemistry_score,
+    source_record_id, load_datetime
+FROM dw.fact_teammate_relationship
+UNION ALL
+SELECT 
+    teammate_fact_sk, teammate_player_sk, player_sk,
+    minutes_played_together, ppg_played_with, joint_goal_participation, chemistry_score,
+    source_record_id, load_datetime
+FROM dw.fact_teammate_relationship;
+
+COMMENT ON VIEW dw.v_teammate_relationship_directional IS 'fact_teammate_relationship with each pair listed from both players';
 
 -- ============================================================
 -- Aggregate/Summary Tables (optional - for performance)
@@ -300,3 +323,25 @@ CREATE INDEX idx_fact_player_season_player ON dw.fact_player_season_summary(play
 CREATE INDEX idx_fact_player_season_season ON dw.fact_player_season_summary(season_sk);
 
 COMMENT ON TABLE dw.fact_player_season_summary IS 'Pre-aggregated player statistics by season for fast reporting';
+
+-- ============================================================
+-- ETL control: high-watermarks for incremental fact loads
+-- ============================================================
+CREATE TABLE dw.etl_watermark (
+    table_name VARCHAR(100) PRIMARY KEY,
+    watermark DATE NOT NULL, -- Latest source date loaded (e.g. MAX(date_unix))
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE dw.etl_watermark IS 'High-watermarks of incremental fact loads';
+
+-- Player-seasons whose performance or injury facts changed since the last
+-- fact_player_season_summary refresh
+CREATE TABLE dw.etl_dirty_player_season (
+    player_sk BIGINT NOT NULL,
+    season_sk INTEGER NOT NULL,
+    marked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (player_sk, season_sk)
+);
+
+COMMENT ON TABLE dw.etl_dirty_player_season IS 'Queue of player-seasons to re-aggregate into fact_player_season_summary';
@@ -94,8 +94,8 @@ BEGIN
     
     -- If not found, insert it with minimal info
     IF NOT FOUND THEN
-        INSERT INTO dw.dim_team (team_nk, team_name)
-        VALUES (p_team_nk, COALESCE(p_team_name, 'Unknown'))
+        INSERT INTO dw.dim_team (team_nk, team_name, is_inferred)
+        VALUES (p_team_nk, COALESCE(p_team_name, 'Unknown'), TRUE)
         RETURNING team_sk INTO v_team_sk;
     END IF;
     
@@ -168,16 +168,16 @@ CREATE OR REPLACE FUNCTION dw.calculate_player_hash(
     p_agent_sk INTEGER
 )
 RETURNS VARCHAR(64) AS $$
-BEGIN
-    RETURN MD5(
+    -- Plain SQL so the planner can inline it into set-based queries.
+    -- Mirrored by calculate_player_hash() in load_dimensions.py.
+    SELECT MD5(
         COALESCE(p_player_name, '') ||
         COALESCE(p_position, '') ||
         COALESCE(p_current_club_nk, '') ||
         COALESCE(p_contract_expires::TEXT, '') ||
         COALESCE(p_agent_sk::TEXT, '')
     );
-END;
-$$ LANGUAGE plpgsql IMMUTABLE;
+$$ LANGUAGE sql IMMUTABLE;
 
 -- ============================================================
 -- Procedure: Populate Date Dimension
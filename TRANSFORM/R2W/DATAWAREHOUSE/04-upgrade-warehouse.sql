@@ -0,0 +1,258 @@
+-- ============================================================
+-- FOOTBALL DATA WAREHOUSE - UPGRADE EXISTING WAREHOUSE
+-- Brings a warehouse created from older versions of 01-03 up to
+-- date without rebuilding it (a rebuild would discard SCD2 history).
+-- Every statement is idempotent; on a fresh warehouse it is a no-op.
+-- Run after 03-helper-functions.sql.
+-- ============================================================
+
+-- ============================================================
+-- Injury classification rules and reason map (load_dim_injury_type)
+-- ============================================================
+CREATE TABLE IF NOT EXISTS dw.injury_classification_rule (
+    rule_id SERIAL PRIMARY KEY,
+    keyword VARCHAR(100) NOT NULL UNIQUE, -- case-insensitive substring of injury_reason
+    injury_category VARCHAR(100) NOT NULL,
+    injury_severity VARCHAR(50),
+    priority INTEGER NOT NULL -- lower value wins when several keywords match
+);
+
+COMMENT ON TABLE dw.injury_classification_rule IS 'Editable keyword rules for classifying injury reasons';
+
+-- Seed rules only for keywords that are not there yet, so edited rules are kept
+INSERT INTO dw.injury_classification_rule (keyword, injury_category, injury_severity, priority) VALUES
+('muscle', 'Muscular', 'Medium', 1),
+('strain', 'Muscular', 'Medium', 1),
+('tear', 'Muscular', 'Medium', 1),
+('fracture', 'Bone/Ligament', 'High', 2),
+('break', 'Bone/Ligament', 'High', 2),
+('rupture', 'Bone/Ligament', 'High', 2),
+('ankle', 'Joint', 'Medium', 3),
+('knee', 'Joint', 'Medium', 3),
+('hip', 'Joint', 'Medium', 3)
+ON CONFLICT (keyword) DO NOTHING;
+
+CREATE TABLE IF NOT EXISTS dw.injury_reason_map (
+    injury_reason TEXT PRIMARY KEY,
+    injury_type_sk INTEGER NOT NULL REFERENCES dw.dim_injury_type(injury_type_sk),
+    rule_id INTEGER REFERENCES dw.injury_classification_rule(rule_id) ON DELETE SET NULL, -- NULL for the fallback
+    load_datetime TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE dw.injury_reason_map IS 'Classification of each source injury_reason into dim_injury_type';
+
+-- ============================================================
+-- dim_team.is_inferred (create_inferred_teams, get_or_create_team_sk)
+-- Existing teams default to FALSE, i.e. known from team_details
+-- ============================================================
+ALTER TABLE dw.dim_team ADD COLUMN IF NOT EXISTS is_inferred BOOLEAN DEFAULT FALSE;
+
+-- ============================================================
+-- dim_player.source_row_hash (load_dim_player)
+-- Versions hashed by the old Python implementation are re-hashed from
+-- their stored attributes, so the switch to dw.calculate_player_hash
+-- does not expire every player on the next load
+-- ============================================================
+UPDATE dw.dim_player
+SET source_row_hash = dw.calculate_player_hash(
+    player_name, position, current_club_nk, contract_expires, agent_sk
+)
+WHERE is_current = TRUE
+  AND source_row_hash IS DISTINCT FROM dw.calculate_player_hash(
+    player_name, position, current_club_nk, contract_expires, agent_sk
+  );
+
+-- ============================================================
+-- fact_player_performance LIST-partitioned by season_sk
+-- (create_season_partitions, reload_season_partition)
+-- An unpartitioned table is rebuilt as a partitioned one in a single
+-- transaction: rows are copied into one partition per season, the
+-- performance_sk sequence is kept, and views reading the table are
+-- recreated from their saved definitions
+-- ============================================================
+DO $$
+DECLARE
+    v_sequence TEXT;
+    v_season_sk INTEGER;
+    v_dropped BIGINT;
+    v_view RECORD;
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = 'dw.fact_player_performance'::regclass) = 'p' THEN
+        RETURN;
+    END IF;
+
+    CREATE TEMP TABLE tmp_dependent_views ON COMMIT DROP AS
+    SELECT DISTINCT v.oid::regclass::text AS view_name,
+           rtrim(pg_get_viewdef(v.oid), ';') AS definition,
+           obj_description(v.oid, 'pg_class') AS description
+    FROM pg_depend d
+    JOIN pg_rewrite r ON r.oid = d.objid
+    JOIN pg_class v ON v.oid = r.ev_class
+    WHERE d.classid = 'pg_rewrite'::regclass
+      AND d.refobjid = 'dw.fact_player_performance'::regclass
+      AND v.oid <> d.refobjid;
+    FOR v_view IN SELECT * FROM tmp_dependent_views LOOP
+        EXECUTE format('DROP VIEW %s', v_view.view_name);
+    END LOOP;
+
+    -- Free the names the partitioned table and its indexes will use
+    v_sequence := pg_get_serial_sequence('dw.fact_player_performance', 'performance_sk');
+    EXECUTE format('ALTER SEQUENCE %s OWNED BY NONE', v_sequence);
+    ALTER TABLE dw.fact_player_performance RENAME TO fact_player_performance_unpartitioned;
+    ALTER TABLE dw.fact_player_performance_unpartitioned
+        RENAME CONSTRAINT fact_player_performance_pkey TO fact_player_performance_unpartitioned_pkey;
+    DROP INDEX IF EXISTS dw.idx_fact_performance_player;
+    DROP INDEX IF EXISTS dw.idx_fact_performance_team;
+    DROP INDEX IF EXISTS dw.idx_fact_performance_competition;
+    DROP INDEX IF EXISTS dw.idx_fact_performance_season;
+    DROP INDEX IF EXISTS dw.idx_fact_performance_season_name;
+    DROP INDEX IF EXISTS dw.idx_fact_performance_composite;
+
+    -- Same definition as 02-create-facts.sql; the column default still uses the old sequence
+    CREATE TABLE dw.fact_player_performance (
+        LIKE dw.fact_player_performance_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+        PRIMARY KEY (performance_sk, season_sk),
+        FOREIGN KEY (player_sk) REFERENCES dw.dim_player(player_sk),
+        FOREIGN KEY (team_sk) REFERENCES dw.dim_team(team_sk),
+        FOREIGN KEY (competition_sk) REFERENCES dw.dim_competition(competition_sk),
+        FOREIGN KEY (season_sk) REFERENCES dw.dim_season(season_sk)
+    ) PARTITION BY LIST (season_sk);
+    ALTER TABLE dw.fact_player_performance ALTER COLUMN season_sk SET NOT NULL;
+    EXECUTE format('ALTER SEQUENCE %s OWNED BY dw.fact_player_performance.performance_sk', v_sequence);
+
+    CREATE TABLE dw.fact_player_performance_default
+        PARTITION OF dw.fact_player_performance DEFAULT;
+    FOR v_season_sk IN
+        SELECT DISTINCT season_sk FROM dw.fact_player_performance_unpartitioned
+        WHERE season_sk IS NOT NULL ORDER BY season_sk
+    LOOP
+        EXECUTE format('CREATE TABLE dw.fact_player_performance_s%s PARTITION OF dw.fact_player_performance '
+                       'FOR VALUES IN (%s)', v_season_sk, v_season_sk);
+    END LOOP;
+
+    CREATE INDEX idx_fact_performance_player ON dw.fact_player_performance(player_sk);
+    CREATE INDEX idx_fact_performance_team ON dw.fact_player_performance(team_sk);
+    CREATE INDEX idx_fact_performance_competition ON dw.fact_player_performance(competition_sk);
+    CREATE INDEX idx_fact_performance_season_name ON dw.fact_player_performance(season_name);
+    CREATE INDEX idx_fact_performance_composite ON dw.fact_player_performance(player_sk, season_sk, team_sk);
+    COMMENT ON TABLE dw.fact_player_performance IS 'Player performance metrics by competition and season';
+
+    -- Rows without a season cannot be partitioned; load_facts.py never produces them
+    INSERT INTO dw.fact_player_performance
+    SELECT * FROM dw.fact_player_performance_unpartitioned WHERE season_sk IS NOT NULL;
+    SELECT COUNT(*) INTO v_dropped
+    FROM dw.fact_player_performance_unpartitioned WHERE season_sk IS NULL;
+    IF v_dropped > 0 THEN
+        RAISE NOTICE 'Skipped % fact_player_performance rows without a season_sk', v_dropped;
+    END IF;
+    DROP TABLE dw.fact_player_performance_unpartitioned;
+
+    FOR v_view IN SELECT * FROM tmp_dependent_views LOOP
+        EXECUTE format('CREATE VIEW %s AS %s', v_view.view_name, v_view.definition);
+        IF v_view.description IS NOT NULL THEN
+            EXECUTE format('COMMENT ON VIEW %s IS %L', v_view.view_name, v_view.description);
+        END IF;
+    END LOOP;
+    RAISE NOTICE 'fact_player_performance is now partitioned by season_sk';
+END;
+$$;
+
+-- ============================================================
+-- ETL high-watermarks (load_fact_market_value, --incremental)
+-- ============================================================
+CREATE TABLE IF NOT EXISTS dw.etl_watermark (
+    table_name VARCHAR(100) PRIMARY KEY,
+    watermark DATE NOT NULL, -- Latest source date loaded (e.g. MAX(date_unix))
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE dw.etl_watermark IS 'High-watermarks of incremental fact loads';
+
+-- ============================================================
+-- Queue of player-seasons for the fact_player_season_summary refresh
+-- (reload_fact, mark_dirty)
+-- ============================================================
+CREATE TABLE IF NOT EXISTS dw.etl_dirty_player_season (
+    player_sk BIGINT NOT NULL,
+    season_sk INTEGER NOT NULL,
+    marked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (player_sk, season_sk)
+);
+
+COMMENT ON TABLE dw.etl_dirty_player_season IS 'Queue of player-seasons to re-aggregate into fact_player_season_summary';
+
+-- ============================================================
+-- Partial index on each player's latest valuation
+-- (refresh_latest_flags, latest-value lookups)
+-- Older warehouses have a full index of the same name on
+-- (player_sk, is_latest_value); it is replaced
+-- ============================================================
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_index
+        WHERE indexrelid = to_regclass('dw.idx_fact_market_value_latest')
+          AND indpred IS NULL
+    ) THEN
+        DROP INDEX dw.idx_fact_market_value_latest;
+    END IF;
+END;
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_fact_market_value_latest ON dw.fact_market_value(player_sk)
+    INCLUDE (market_value) WHERE is_latest_value;
+
+-- ============================================================
+-- fact_teammate_relationship: one row per unordered pair
+-- (load_fact_teammate_relationship)
+-- Rows loaded in both directions are reduced to the side with the most
+-- shared minutes and stored with the lower player_sk first, so the
+-- CHECK can be added
+-- ============================================================
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conrelid = 'dw.fact_teammate_relationship'::regclass
+          AND conname = 'check_canonical_pair'
+    ) THEN
+        RETURN;
+    END IF;
+
+    DELETE FROM dw.fact_teammate_relationship WHERE player_sk = teammate_player_sk;
+    DELETE FROM dw.fact_teammate_relationship f
+    USING (
+        SELECT teammate_fact_sk,
+               ROW_NUMBER() OVER (
+                   PARTITION BY LEAST(player_sk, teammate_player_sk), GREATEST(player_sk, teammate_player_sk)
+                   ORDER BY minutes_played_together DESC NULLS LAST, teammate_fact_sk
+               ) as pair_rank
+        FROM dw.fact_teammate_relationship
+    ) ranked
+    WHERE ranked.teammate_fact_sk = f.teammate_fact_sk
+      AND ranked.pair_rank > 1;
+    UPDATE dw.fact_teammate_relationship
+    SET player_sk = teammate_player_sk,
+        teammate_player_sk = player_sk
+    WHERE player_sk > teammate_player_sk;
+
+    ALTER TABLE dw.fact_teammate_relationship
+        ADD CONSTRAINT check_canonical_pair CHECK (player_sk < teammate_player_sk);
+END;
+$$;
+
+-- Both directions of every pair, for "teammates of player X" queries
+CREATE OR REPLACE VIEW dw.v_teammate_relationship_directional AS
+SELECT 
+    teammate_fact_sk, player_sk, teammate_player_sk,
+    minutes_played_together, ppg_played_with, joint_goal_participation, chemistry_score,
+    source_record_id, load_datetime
+FROM dw.fact_teammate_relationship
+UNION ALL
+SELECT 
+    teammate_fact_sk, teammate_player_sk, player_sk,
+    minutes_played_together, ppg_played_with, joint_goal_participation, chemistry_score,
+    source_record_id, load_datetime
+FROM dw.fact_teammate_relationship;
+
+COMMENT ON VIEW dw.v_teammate_relationship_directional IS 'fact_teammate_relationship with each pair listed from both players';
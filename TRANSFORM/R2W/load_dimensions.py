@@ -3,10 +3,14 @@ ETL Script: Load Dimension Tables
 Transforms data from source relational database to star schema dimensions
 """
 
+import io
 import psycopg2
+from psycopg2.extras import execute_values
 import pandas as pd
 from datetime import datetime
 import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from tqdm import tqdm
 import os
 from dotenv import load_dotenv
@@ -23,14 +27,127 @@ DB_CONFIG = {
     'password': os.getenv('DB_PASSWORD', 'football_pass_2025')
 }
 
+# Rows sent per execute_values statement
+BATCH_SIZE = 5000
+
+# Dimensions loaded concurrently, each on its own connection
+DIMENSION_WORKERS = int(os.getenv('DIMENSION_WORKERS', '5'))
+
 def get_connection():
     """Create database connection"""
     return psycopg2.connect(**DB_CONFIG)
 
-def calculate_hash(*args):
-    """Calculate MD5 hash for SCD Type 2 change detection"""
-    concat_str = ''.join([str(arg) if arg is not None else '' for arg in args])
-    return hashlib.md5(concat_str.encode()).hexdigest()
+def to_python(value):
+    """Convert pandas/numpy scalars to plain Python values (missing values become None)"""
+    if value is None or value is pd.NA or value is pd.NaT:
+        return None
+    if isinstance(value, float) and value != value:
+        return None
+    return value.item() if hasattr(value, 'item') else value
+
+def calculate_player_hash(df):
+    """Vectorized MD5 of the SCD Type 2 tracked attributes, one hash per row
+
+    Mirrors dw.calculate_player_hash: player_name, position, current_club_nk,
+    contract_expires and agent_sk are concatenated with NULLs as '', dates
+    as 'YYYY-MM-DD' and agent_sk without a decimal part.
+    """
+    contract_expires = pd.to_datetime(df['contract_expires']).dt.strftime('%Y-%m-%d')
+    parts = [
+        df['player_name'].astype('string'),
+        df['position'].astype('string'),
+        df['current_club_nk'].astype('string'),
+        contract_expires.astype('string'),
+        df['agent_sk'].astype('Int64').astype('string')
+    ]
+    concat = parts[0].fillna('')
+    for part in parts[1:]:
+        concat = concat + part.fillna('')
+    return pd.Series([hashlib.md5(value.encode()).hexdigest() for value in concat],
+                     index=df.index, dtype='object')
+
+# (table, column) pairs whose dates the facts resolve through dim_date
+DATE_SOURCE_COLUMNS = [
+    ('transfer_history', 'transfer_date'),
+    ('player_injuries', 'from_date'),
+    ('player_injuries', 'end_date'),
+    ('player_market_value', 'date_unix'),
+    ('player_national_performances', 'first_game_date'),
+    ('player_profiles', 'date_of_birth')
+]
+
+def build_date_attributes(dates):
+    """Calendar attributes for a DatetimeIndex, matching dw.populate_date_dimension
+
+    Month and day names are padded to 9 characters like TO_CHAR's 'Month'
+    and 'Day', day_of_week counts from 0 = Sunday like EXTRACT(DOW), and
+    week_of_year is the ISO week like EXTRACT(WEEK).
+    """
+    dates = pd.DatetimeIndex(dates)
+    day_of_week = (dates.dayofweek + 1) % 7
+    season_start = dates.year - (dates.month < 7)
+    return pd.DataFrame({
+        'date_value': dates.strftime('%Y-%m-%d'),
+        'year': dates.year,
+        'quarter': dates.quarter,
+        'month': dates.month,
+        'month_name': dates.month_name().str.ljust(9),
+        'day': dates.day,
+        'day_of_week': day_of_week,
+        'day_name': dates.day_name().str.ljust(9),
+        'week_of_year': dates.isocalendar().week.to_numpy(),
+        'is_weekend': (day_of_week == 0) | (day_of_week == 6),
+        'season_name': (pd.Series(season_start % 100).map('{:02d}'.format) + '/'
+                        + pd.Series((season_start + 1) % 100).map('{:02d}'.format)).to_numpy()
+    })
+
+def load_dim_date(conn):
+    """Pre-generate Date Dimension rows for every date the facts reference"""
+    print("\n=== Loading dim_date ===")
+    
+    cursor = conn.cursor()
+    
+    # One scan for the overall range of all fact date columns
+    bounds = " UNION ALL ".join(
+        f"SELECT MIN({column}), MAX({column}) FROM {table}" for table, column in DATE_SOURCE_COLUMNS
+    )
+    cursor.execute(f"SELECT MIN(min_date), MAX(max_date) FROM ({bounds}) AS b(min_date, max_date)")
+    min_date, max_date = cursor.fetchone()
+    if min_date is None:
+        print("[OK] No source dates found")
+        return
+    print(f"Source dates range from {min_date} to {max_date}")
+    
+    cursor.execute(
+        "SELECT date_value FROM dw.dim_date WHERE date_value BETWEEN %s AND %s",
+        (min_date, max_date)
+    )
+    existing = pd.DatetimeIndex([row[0] for row in cursor.fetchall()])
+    missing = pd.date_range(min_date, max_date, freq='D').difference(existing)
+    print(f"Missing dates: {len(missing):,}")
+    
+    if len(missing) > 0:
+        df = build_date_attributes(missing)
+        buffer = io.StringIO()
+        df.to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+        
+        columns = ', '.join(df.columns)
+        cursor.execute(f"CREATE TEMP TABLE tmp_dim_date ON COMMIT DROP AS "
+                       f"SELECT {columns} FROM dw.dim_date WITH NO DATA")
+        cursor.copy_expert(f"COPY tmp_dim_date ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+        # get_date_sk may have created some of these dates concurrently
+        cursor.execute(f"""
+        INSERT INTO dw.dim_date ({columns})
+        SELECT {columns} FROM tmp_dim_date
+        ON CONFLICT (date_value) DO NOTHING
+        """)
+        print(f"Inserted {cursor.rowcount:,} dates")
+    
+    conn.commit()
+    cursor.execute("SELECT COUNT(*) FROM dw.dim_date")
+    count = cursor.fetchone()[0]
+    print(f"[OK] Loaded {count} dates")
 
 def load_dim_agent(conn):
     """Load Agent Dimension from player_profiles"""
@@ -38,29 +155,21 @@ def load_dim_agent(conn):
     
     cursor = conn.cursor()
     
-    # Extract unique agents from source
-    query = """
-    SELECT DISTINCT 
+    # Source and target share the database, so the upsert runs server side.
+    # DISTINCT ON keeps one row per agent_id, since a single INSERT ... ON CONFLICT
+    # cannot update the same target row twice.
+    cursor.execute("""
+    INSERT INTO dw.dim_agent (agent_id, agent_name)
+    SELECT DISTINCT ON (player_agent_id)
         player_agent_id,
         player_agent_name
     FROM player_profiles
     WHERE player_agent_id IS NOT NULL
-    ORDER BY player_agent_id
-    """
-    
-    df = pd.read_sql(query, conn)
-    print(f"Found {len(df)} unique agents")
-    
-    # Insert into dimension
-    insert_query = """
-    INSERT INTO dw.dim_agent (agent_id, agent_name)
-    VALUES (%s, %s)
+    ORDER BY player_agent_id, player_agent_name
     ON CONFLICT (agent_id) DO UPDATE 
     SET agent_name = EXCLUDED.agent_name
-    """
-    
-    for _, row in tqdm(df.iterrows(), total=len(df), desc="Loading agents"):
-        cursor.execute(insert_query, (row['player_agent_id'], row['player_agent_name']))
+    """)
+    print(f"Upserted {cursor.rowcount} agents")
     
     conn.commit()
     cursor.execute("SELECT COUNT(*) FROM dw.dim_agent")
@@ -73,9 +182,10 @@ def load_dim_team(conn):
     
     cursor = conn.cursor()
     
-    # Extract teams from source
-    query = """
-    SELECT DISTINCT 
+    # One row per club, taken from its most recent season
+    cursor.execute("""
+    INSERT INTO dw.dim_team (team_nk, team_name, country_name, primary_competition_id, division_level)
+    SELECT DISTINCT ON (club_id)
         CAST(club_id AS VARCHAR) as team_id,
         club_name as team_name,
         COALESCE(country_name, 'Unknown') as team_country,
@@ -83,31 +193,16 @@ def load_dim_team(conn):
         COALESCE(CAST(SUBSTRING(club_division FROM '[0-9]+') AS INTEGER), 99) as tier_level
     FROM team_details
     WHERE club_id IS NOT NULL
-    ORDER BY team_id
-    """
-    
-    df = pd.read_sql(query, conn)
-    print(f"Found {len(df)} teams from team_details")
-    
-    # Insert into dimension
-    insert_query = """
-    INSERT INTO dw.dim_team (team_nk, team_name, country_name, primary_competition_id, division_level)
-    VALUES (%s, %s, %s, %s, %s)
+    ORDER BY club_id, season_id DESC
     ON CONFLICT (team_nk) DO UPDATE 
     SET team_name = EXCLUDED.team_name,
         country_name = EXCLUDED.country_name,
         primary_competition_id = EXCLUDED.primary_competition_id,
-        division_level = EXCLUDED.division_level
-    """
-    
-    for _, row in tqdm(df.iterrows(), total=len(df), desc="Loading teams"):
-        cursor.execute(insert_query, (
-            row['team_id'],
-            row['team_name'],
-            row['team_country'],
-            row['competition_name'],
-            row['tier_level']
-        ))
+        division_level = EXCLUDED.division_level,
+        -- Teams first created from fact references are now fully known
+        is_inferred = FALSE
+    """)
+    print(f"Upserted {cursor.rowcount} teams from team_details")
     
     conn.commit()
     cursor.execute("SELECT COUNT(*) FROM dw.dim_team")
@@ -120,39 +215,31 @@ def load_dim_competition(conn):
     
     cursor = conn.cursor()
     
-    # Extract unique competitions
-    query = """
-    SELECT DISTINCT 
-        competition_name,
-        country_name as country,
-        COALESCE(CAST(SUBSTRING(club_division FROM '[0-9]+') AS INTEGER), 99) as tier_level
-    FROM team_details
-    WHERE competition_name IS NOT NULL
-    ORDER BY competition_name
-    """
-    
-    df = pd.read_sql(query, conn)
-    print(f"Found {len(df)} unique competitions")
-    
-    # Generate competition_id from name
-    df['competition_id'] = df['competition_name'].str.lower().str.replace(' ', '_')
-    
-    insert_query = """
+    # competition_id is generated from the name; one row per id from its most recent season
+    cursor.execute("""
     INSERT INTO dw.dim_competition (competition_id, competition_name, country_name, tier_level)
-    VALUES (%s, %s, %s, %s)
+    SELECT DISTINCT ON (competition_id)
+        competition_id,
+        competition_name,
+        country,
+        tier_level
+    FROM (
+        SELECT 
+            LOWER(REPLACE(competition_name, ' ', '_')) as competition_id,
+            competition_name,
+            country_name as country,
+            COALESCE(CAST(SUBSTRING(club_division FROM '[0-9]+') AS INTEGER), 99) as tier_level,
+            season_id
+        FROM team_details
+        WHERE competition_name IS NOT NULL
+    ) src
+    ORDER BY competition_id, season_id DESC
     ON CONFLICT (competition_id) DO UPDATE 
     SET competition_name = EXCLUDED.competition_name,
         country_name = EXCLUDED.country_name,
         tier_level = EXCLUDED.tier_level
-    """
-    
-    for _, row in tqdm(df.iterrows(), total=len(df), desc="Loading competitions"):
-        cursor.execute(insert_query, (
-            row['competition_id'],
-            row['competition_name'],
-            row['country'],
-            row['tier_level']
-        ))
+    """)
+    print(f"Upserted {cursor.rowcount} competitions")
     
     conn.commit()
     cursor.execute("SELECT COUNT(*) FROM dw.dim_competition")
@@ -203,27 +290,25 @@ def load_dim_season(conn):
     df[['start_year', 'end_year']] = df['season_name'].apply(
         lambda x: pd.Series(parse_season(x))
     )
+    df[['start_year', 'end_year']] = df[['start_year', 'end_year']].astype('Int64')
     
     # Mark current season (24/25 or latest)
     current_season = df.iloc[0]['season_name'] if len(df) > 0 else None
     
     insert_query = """
     INSERT INTO dw.dim_season (season_name, season_start_year, season_end_year, is_current_season)
-    VALUES (%s, %s, %s, %s)
+    VALUES %s
     ON CONFLICT (season_name) DO UPDATE 
     SET season_start_year = EXCLUDED.season_start_year,
         season_end_year = EXCLUDED.season_end_year,
         is_current_season = EXCLUDED.is_current_season
     """
     
-    for _, row in tqdm(df.iterrows(), total=len(df), desc="Loading seasons"):
-        is_current = (row['season_name'] == current_season)
-        cursor.execute(insert_query, (
-            row['season_name'],
-            row['start_year'],
-            row['end_year'],
-            is_current
-        ))
+    records = [
+        (row.season_name, to_python(row.start_year), to_python(row.end_year), row.season_name == current_season)
+        for row in df.itertuples(index=False)
+    ]
+    execute_values(cursor, insert_query, records, page_size=BATCH_SIZE)
     
     conn.commit()
     cursor.execute("SELECT COUNT(*) FROM dw.dim_season")
@@ -231,67 +316,87 @@ def load_dim_season(conn):
     print(f"[OK] Loaded {count} seasons")
 
 def load_dim_injury_type(conn):
-    """Load Injury Type Dimension from player_injuries"""
+    """Load Injury Type Dimension and the injury_reason map from player_injuries
+
+    Reasons are classified in one query against dw.injury_classification_rule:
+    the matching keyword with the lowest priority wins, unmatched reasons
+    become 'Other'/'Low'. The result is kept in dw.injury_reason_map so the
+    injury fact load can join it instead of reclassifying every row.
+    """
     print("\n=== Loading dim_injury_type ===")
     
     cursor = conn.cursor()
     
-    # Extract unique injury types (using injury_reason as injury type)
-    query = """
-    SELECT DISTINCT 
-        injury_reason as injury_type,
-        COUNT(*) as frequency
-    FROM player_injuries
-    WHERE injury_reason IS NOT NULL
-    GROUP BY injury_reason
-    ORDER BY frequency DESC
-    """
-    
-    df = pd.read_sql(query, conn)
-    print(f"Found {len(df)} unique injury types")
-    
-    # Categorize injuries (simple categorization)
-    def categorize_injury(injury_type):
-        injury_lower = injury_type.lower() if injury_type else ''
-        if any(word in injury_lower for word in ['muscle', 'strain', 'tear']):
-            return 'Muscular', 'Medium'
-        elif any(word in injury_lower for word in ['fracture', 'break', 'rupture']):
-            return 'Bone/Ligament', 'High'
-        elif any(word in injury_lower for word in ['ankle', 'knee', 'hip']):
-            return 'Joint', 'Medium'
-        else:
-            return 'Other', 'Low'
-    
-    df[['category', 'severity']] = df['injury_type'].apply(
-        lambda x: pd.Series(categorize_injury(x))
+    cursor.execute("""
+    CREATE TEMP TABLE tmp_injury_classification ON COMMIT DROP AS
+    SELECT DISTINCT ON (r.injury_reason)
+        r.injury_reason,
+        COALESCE(c.injury_category, 'Other') as category,
+        COALESCE(c.injury_severity, 'Low') as severity,
+        c.rule_id
+    FROM (
+        SELECT DISTINCT injury_reason
+        FROM player_injuries
+        WHERE injury_reason IS NOT NULL
+    ) r
+    LEFT JOIN dw.injury_classification_rule c
+           ON POSITION(LOWER(c.keyword) IN LOWER(r.injury_reason)) > 0
+    ORDER BY r.injury_reason, c.priority NULLS LAST, c.rule_id
+    """)
+    print(f"Classified {cursor.rowcount} unique injury reasons")
+    
+    # dim_injury_type has no unique key, so existing combinations are filtered in the INSERT
+    cursor.execute("""
+    INSERT INTO dw.dim_injury_type (injury_category, injury_severity)
+    SELECT DISTINCT v.category, v.severity
+    FROM tmp_injury_classification v
+    WHERE NOT EXISTS (
+        SELECT 1 FROM dw.dim_injury_type t
+        WHERE t.injury_category = v.category AND t.injury_severity = v.severity
     )
+    """)
+    
+    cursor.execute("""
+    INSERT INTO dw.injury_reason_map (injury_reason, injury_type_sk, rule_id)
+    SELECT v.injury_reason, t.injury_type_sk, v.rule_id
+    FROM tmp_injury_classification v
+    JOIN (
+        SELECT injury_category, injury_severity, MIN(injury_type_sk) as injury_type_sk
+        FROM dw.dim_injury_type
+        GROUP BY injury_category, injury_severity
+    ) t ON t.injury_category = v.category AND t.injury_severity = v.severity
+    ON CONFLICT (injury_reason) DO UPDATE
+    SET injury_type_sk = EXCLUDED.injury_type_sk,
+        rule_id = EXCLUDED.rule_id,
+        load_datetime = CURRENT_TIMESTAMP
+    WHERE dw.injury_reason_map.injury_type_sk IS DISTINCT FROM EXCLUDED.injury_type_sk
+       OR dw.injury_reason_map.rule_id IS DISTINCT FROM EXCLUDED.rule_id
+    """)
+    print(f"Updated {cursor.rowcount} injury_reason_map entries")
     
-    # Insert unique categories only
-    unique_categories = df[['category', 'severity']].drop_duplicates()
+    conn.commit()
     
-    for _, row in tqdm(unique_categories.iterrows(), total=len(unique_categories), desc="Loading injury types"):
-        # Check if this combination already exists
-        check_query = """
-        SELECT injury_type_sk FROM dw.dim_injury_type 
-        WHERE injury_category = %s AND injury_severity = %s
-        """
-        cursor.execute(check_query, (row['category'], row['severity']))
-        
-        if cursor.fetchone() is None:
-            # Insert if not exists
-            insert_query = """
-            INSERT INTO dw.dim_injury_type (injury_category, injury_severity)
-            VALUES (%s, %s)
-            """
-            cursor.execute(insert_query, (row['category'], row['severity']))
+    cursor.execute("""
+    SELECT t.injury_category, t.injury_severity, COUNT(*)
+    FROM dw.injury_reason_map m
+    JOIN dw.dim_injury_type t ON m.injury_type_sk = t.injury_type_sk
+    GROUP BY t.injury_category, t.injury_severity
+    ORDER BY COUNT(*) DESC
+    """)
+    for category, severity, reasons in cursor.fetchall():
+        print(f"  {category:20s} {severity or '':10s} {reasons:>8,} reasons")
     
-    conn.commit()
     cursor.execute("SELECT COUNT(*) FROM dw.dim_injury_type")
     count = cursor.fetchone()[0]
     print(f"[OK] Loaded {count} injury types")
 
 def load_dim_player(conn):
-    """Load Player Dimension with SCD Type 2 from player_profiles"""
+    """Load Player Dimension with SCD Type 2 from player_profiles
+
+    Incremental merge: only players whose source_row_hash differs from their
+    current version are expired and re-inserted, and players without a
+    current version are added. A re-run on unchanged sources writes no rows.
+    """
     print("\n=== Loading dim_player (SCD Type 2) ===")
     
     cursor = conn.cursor()
@@ -305,13 +410,21 @@ def load_dim_player(conn):
         p.date_of_birth,
         p.height,
         p.foot,
-        p.current_club_id,
+        CAST(p.current_club_id AS VARCHAR) as current_club_nk,
         p.current_club_name,
         p.country_of_birth,
         p.citizenship,
         p.contract_expires,
         p.player_agent_id,
-        a.agent_sk
+        a.agent_sk,
+        -- Hashed during extraction, the same function the stored versions are checked with
+        dw.calculate_player_hash(
+            p.player_name,
+            p.position,
+            CAST(p.current_club_id AS VARCHAR),
+            p.contract_expires,
+            a.agent_sk
+        ) as source_row_hash
     FROM player_profiles p
     LEFT JOIN dw.dim_agent a ON p.player_agent_id = a.agent_id
     WHERE p.player_id IS NOT NULL
@@ -322,63 +435,178 @@ def load_dim_player(conn):
     df = pd.read_sql(query, conn)
     print(f"Found {len(df)} players")
     
-    # Calculate hash for SCD detection
-    df['source_row_hash'] = df.apply(
-        lambda row: calculate_hash(
-            row['player_name'],
-            row['position'],
-            row['current_club_id'],
-            row['contract_expires'],
-            row['agent_sk']
-        ),
-        axis=1
-    )
-    
-    insert_query = """
+    # Keep agent_sk an integer when the column has NULLs
+    df['agent_sk'] = df['agent_sk'].astype('Int64')
+    
+    columns = [
+        'player_id', 'player_name', 'position', 'date_of_birth', 'height',
+        'foot', 'current_club_nk', 'current_club_name',
+        'country_of_birth', 'citizenship', 'contract_expires',
+        'agent_sk', 'source_row_hash'
+    ]
+    records = [tuple(to_python(value) for value in row)
+               for row in df[columns].itertuples(index=False, name=None)]
+    
+    # Stage the extract so the SCD2 merge runs as set-based SQL
+    cursor.execute("""
+    CREATE TEMP TABLE tmp_player_source (
+        player_nk INTEGER PRIMARY KEY,
+        player_name VARCHAR(255),
+        position VARCHAR(100),
+        date_of_birth DATE,
+        height_cm DECIMAL(5,2),
+        foot VARCHAR(20),
+        current_club_nk VARCHAR(50),
+        current_club_name VARCHAR(255),
+        country_of_birth VARCHAR(100),
+        citizenship VARCHAR(100),
+        contract_expires DATE,
+        agent_sk INTEGER,
+        source_row_hash VARCHAR(64)
+    ) ON COMMIT DROP
+    """)
+    with tqdm(total=len(records), desc="Staging players") as pbar:
+        for start in range(0, len(records), BATCH_SIZE):
+            batch = records[start:start + BATCH_SIZE]
+            execute_values(cursor, "INSERT INTO tmp_player_source VALUES %s", batch, page_size=BATCH_SIZE)
+            pbar.update(len(batch))
+    
+    # Expired versions end where their replacements start
+    load_time = datetime.now()
+    
+    # Earlier runs inserted every player as a new current row; keep only the latest one
+    cursor.execute("""
+    UPDATE dw.dim_player d
+    SET is_current = FALSE,
+        valid_to = %s
+    FROM (
+        SELECT player_nk, MAX(player_sk) AS keep_sk
+        FROM dw.dim_player
+        WHERE is_current = TRUE
+        GROUP BY player_nk
+        HAVING COUNT(*) > 1
+    ) dup
+    WHERE d.player_nk = dup.player_nk
+      AND d.is_current = TRUE
+      AND d.player_sk <> dup.keep_sk
+    """, (load_time,))
+    collapsed = cursor.rowcount
+    
+    # Expire current versions whose tracked attributes changed
+    cursor.execute("""
+    UPDATE dw.dim_player d
+    SET is_current = FALSE,
+        valid_to = %s
+    FROM tmp_player_source s
+    WHERE d.player_nk = s.player_nk
+      AND d.is_current = TRUE
+      AND d.source_row_hash IS DISTINCT FROM s.source_row_hash
+    """, (load_time,))
+    changed = cursor.rowcount
+    
+    # Insert a current version for new players and for the ones just expired
+    cursor.execute("""
     INSERT INTO dw.dim_player (
         player_nk, player_name, position, date_of_birth, height_cm, 
         foot, current_club_nk, current_club_name,
         country_of_birth, citizenship, contract_expires,
         agent_sk, valid_from, valid_to, is_current, source_row_hash
     )
-    VALUES (
-        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+    SELECT 
+        s.player_nk, s.player_name, s.position, s.date_of_birth, s.height_cm,
+        s.foot, s.current_club_nk, s.current_club_name,
+        s.country_of_birth, s.citizenship, s.contract_expires,
+        s.agent_sk, %s, NULL, TRUE, s.source_row_hash
+    FROM tmp_player_source s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM dw.dim_player d
+        WHERE d.player_nk = s.player_nk AND d.is_current = TRUE
     )
-    """
+    """, (load_time,))
+    inserted = cursor.rowcount
     
-    valid_from = datetime.now().date()
+    conn.commit()
     
-    for idx, row in tqdm(df.iterrows(), total=len(df), desc="Loading players"):
-        try:
-            cursor.execute(insert_query, (
-                row['player_id'],
-                row['player_name'],
-                row['position'],
-                row['date_of_birth'],
-                row['height'],
-                row['foot'],
-                str(row['current_club_id']) if pd.notna(row['current_club_id']) else None,
-                row['current_club_name'],
-                row['country_of_birth'],
-                row['citizenship'],
-                row['contract_expires'],
-                int(row['agent_sk']) if pd.notna(row['agent_sk']) else None,
-                valid_from,
-                None,  # valid_to (NULL for current records)
-                True,  # is_current
-                row['source_row_hash']
-            ))
-        except Exception as e:
-            print(f"\n[ERROR] Failed on player {row['player_id']} - {row['player_name']}")
-            print(f"agent_sk value: {row['agent_sk']} (type: {type(row['agent_sk'])})")
-            print(f"Error: {e}")
-            raise
+    new = inserted - changed
+    unchanged = len(records) - inserted
+    print(f"New players:       {new:>10,}")
+    print(f"Changed players:   {changed:>10,}")
+    print(f"Unchanged players: {unchanged:>10,}")
+    if collapsed:
+        print(f"Duplicate current rows expired: {collapsed:,}")
     
-    conn.commit()
     cursor.execute("SELECT COUNT(*) FROM dw.dim_player WHERE is_current = TRUE")
     count = cursor.fetchone()[0]
     print(f"[OK] Loaded {count} current player records")
 
+# dimension -> (loader, dimensions that must be committed first)
+DIMENSION_DAG = {
+    'dim_date': (load_dim_date, []),
+    'dim_agent': (load_dim_agent, []),
+    'dim_team': (load_dim_team, []),
+    'dim_competition': (load_dim_competition, []),
+    'dim_season': (load_dim_season, []),
+    'dim_injury_type': (load_dim_injury_type, []),
+    'dim_player': (load_dim_player, ['dim_agent'])  # Looks up agent_sk
+}
+
+def run_dimension(dim, phase_start):
+    """Load one dimension on its own connection, returning (start, end) offsets in seconds"""
+    load, _ = DIMENSION_DAG[dim]
+    conn = get_connection()
+    try:
+        start = time.perf_counter() - phase_start
+        load(conn)
+        return start, time.perf_counter() - phase_start
+    finally:
+        conn.close()
+
+def load_dimensions_parallel(workers):
+    """Run DIMENSION_DAG on a thread pool, starting each dimension once its dependencies commit
+
+    Returns {dimension: (start, end)} with offsets from the start of the phase.
+    """
+    phase_start = time.perf_counter()
+    timings = {}
+    pending = dict(DIMENSION_DAG)
+    running = {}
+    error = None
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while pending or running:
+            if error is None:
+                ready = [dim for dim, (_, deps) in pending.items() if all(d in timings for d in deps)]
+                for dim in ready:
+                    del pending[dim]
+                    running[executor.submit(run_dimension, dim, phase_start)] = dim
+            if not running:
+                break
+            
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                dim = running.pop(future)
+                try:
+                    timings[dim] = future.result()
+                except Exception as e:
+                    print(f"\n[ERROR] {dim} failed: {e}")
+                    error = error or e
+    
+    if error is not None:
+        raise error
+    return timings
+
+def critical_path(timings):
+    """Longest dependency chain by load time, as (dimensions, seconds)"""
+    paths = {}
+    def longest(dim):
+        if dim not in paths:
+            own = timings[dim][1] - timings[dim][0]
+            chains = [longest(dep) for dep in DIMENSION_DAG[dim][1]]
+            chain, seconds = max(chains, key=lambda c: c[1], default=([], 0.0))
+            paths[dim] = (chain + [dim], seconds + own)
+        return paths[dim]
+    return max((longest(dim) for dim in timings), key=lambda c: c[1])
+
 def main():
     """Main ETL process for dimensions"""
     print("=" * 60)
@@ -386,20 +614,14 @@ def main():
     print("=" * 60)
     print(f"Source: {DB_CONFIG['database']}@{DB_CONFIG['host']}")
     print(f"Target: dw schema in same database")
+    print(f"Workers: {DIMENSION_WORKERS}")
     print("=" * 60)
     
     try:
-        conn = get_connection()
-        
-        # Load dimensions in dependency order
-        load_dim_agent(conn)
-        load_dim_team(conn)
-        load_dim_competition(conn)
-        load_dim_season(conn)
-        load_dim_injury_type(conn)
-        load_dim_player(conn)  # Last because it depends on agent
-        
-        conn.close()
+        # Independent dimensions load concurrently, dim_player once dim_agent commits
+        phase_start = time.perf_counter()
+        timings = load_dimensions_parallel(DIMENSION_WORKERS)
+        wall_clock = time.perf_counter() - phase_start
         
         print("\n" + "=" * 60)
         print("[OK] ALL DIMENSIONS LOADED SUCCESSFULLY")
@@ -422,6 +644,16 @@ def main():
         
         conn.close()
         
+        print("\nDimension Timings:")
+        print(f"  {'dimension':30s}  {'start':>8s}  {'end':>8s}  {'seconds':>8s}")
+        for dim, (start, end) in sorted(timings.items(), key=lambda item: item[1]):
+            print(f"  {dim:30s}  {start:>8.2f}  {end:>8.2f}  {end - start:>8.2f}")
+        
+        path, path_seconds = critical_path(timings)
+        serial = sum(end - start for start, end in timings.values())
+        print(f"\n  Critical path: {' -> '.join(path)} ({path_seconds:.2f} s)")
+        print(f"  Wall clock:    {wall_clock:.2f} s (serial sum {serial:.2f} s)")
+        
     except Exception as e:
         print(f"\n[ERROR] ERROR: {e}")
         raise
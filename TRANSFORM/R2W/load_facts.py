@@ -4,8 +4,15 @@ Transforms data from relational source to star schema facts
 """
 
 import psycopg2
+import io
 import os
+import re
+import time
+import argparse
+import pandas as pd
+from datetime import timedelta
 from dotenv import load_dotenv
+from valuation_series import ValuationSeries
 
 load_dotenv('../DATABASE/.env')
 
@@ -17,17 +24,977 @@ DB_CONFIG = {
     'password': os.getenv('DB_PASSWORD', 'football_pass_2025')
 }
 
+# Days before the high-watermark that incremental market value loads re-read for late corrections
+MARKET_VALUE_LOOKBACK_DAYS = int(os.getenv('MARKET_VALUE_LOOKBACK_DAYS', '30'))
+
 def get_connection():
     return psycopg2.connect(**DB_CONFIG)
 
-def main():
+def mark_dirty(cursor, source, condition='TRUE'):
+    """Record the (player_sk, season_sk) pairs of source for the next season summary refresh"""
+    cursor.execute(f"""
+    INSERT INTO dw.etl_dirty_player_season (player_sk, season_sk)
+    SELECT DISTINCT player_sk, season_sk FROM {source}
+    WHERE season_sk IS NOT NULL AND {condition}
+    ON CONFLICT DO NOTHING
+    """)
+
+def row_hashes(source, key_columns, value_columns, condition='TRUE'):
+    """Query returning key_columns plus an md5 of value_columns for each row of source"""
+    return f"""
+    SELECT {', '.join(key_columns)}, md5(ROW({', '.join(value_columns)})::text) as row_hash
+    FROM {source} WHERE {condition}
+    """
+
+def changed_keys(old_rows, new_rows, key_columns):
+    """Query returning the keys whose multiset of row hashes differs between two row_hashes relations"""
+    keys = ', '.join(key_columns)
+    return f"""
+    SELECT DISTINCT {keys} FROM (
+        (SELECT {keys}, row_hash FROM {old_rows} EXCEPT ALL SELECT {keys}, row_hash FROM {new_rows})
+        UNION ALL
+        (SELECT {keys}, row_hash FROM {new_rows} EXCEPT ALL SELECT {keys}, row_hash FROM {old_rows})
+    ) changed
+    """
+
+def mark_changed_pairs(cursor, changed):
+    """Queue the (player_sk, season_sk) pairs returned by a changed_keys query"""
+    cursor.execute(f"""
+    INSERT INTO dw.etl_dirty_player_season (player_sk, season_sk)
+    SELECT player_sk, season_sk FROM ({changed}) c
+    WHERE season_sk IS NOT NULL
+    ON CONFLICT DO NOTHING
+    """)
+    print(f"Queued {cursor.rowcount:,} changed player-seasons")
+
+def mark_changed_players(cursor, changed):
+    """Queue the summarised player-seasons of the players returned by a changed_keys query"""
+    mark_dirty(cursor, "dw.fact_player_season_summary", f"player_sk IN (SELECT player_sk FROM ({changed}) c)")
+    print(f"Queued {cursor.rowcount:,} player-seasons with changed valuations")
+
+# Columns whose changes reach fact_player_season_summary, per fact table
+PERFORMANCE_CHANGES = (['player_sk', 'season_sk'],
+                       ['goals', 'assists', 'minutes_played', 'yellow_cards',
+                        'second_yellow_cards', 'direct_red_cards'])
+INJURY_CHANGES = (['player_sk', 'season_sk'], ['days_missed', 'games_missed'])
+MARKET_VALUE_CHANGES = (['player_sk'], ['date_sk', 'market_value', 'value_source'])
+
+def reload_fact(conn, table, insert_query, before_insert=None, after_insert=None,
+                changes=None, on_changed=mark_changed_pairs):
+    """Replace a fact table's contents in one transaction, returning (rows, seconds)
+
+    The TRUNCATE and the INSERT ... SELECT commit together, so readers see
+    either the previous contents or the complete reload. before_insert and
+    after_insert, if given, are called with the cursor around the INSERT,
+    inside the same transaction. changes, a (key_columns, value_columns)
+    pair, hashes the rows before the TRUNCATE and after the INSERT;
+    on_changed is then called with a query returning the keys whose rows
+    differ, so only those reach the season summary refresh.
+    """
+    print(f"\n=== Loading {table} ===")
+    
+    cursor = conn.cursor()
+    start_time = time.perf_counter()
+    try:
+        if changes is not None:
+            cursor.execute(f"CREATE TEMP TABLE tmp_old_rows ON COMMIT DROP AS "
+                           f"{row_hashes(f'dw.{table}', *changes)}")
+        cursor.execute(f"TRUNCATE TABLE dw.{table} RESTART IDENTITY")
+        if before_insert is not None:
+            before_insert(cursor)
+        cursor.execute(insert_query)
+        rows = cursor.rowcount
+        if after_insert is not None:
+            after_insert(cursor)
+        if changes is not None:
+            on_changed(cursor, changed_keys("tmp_old_rows", f"({row_hashes(f'dw.{table}', *changes)}) new_rows",
+                                            changes[0]))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    
+    elapsed = time.perf_counter() - start_time
+    rate = rows / elapsed if elapsed > 0 else 0
+    print(f"[OK] Loaded {rows:,} rows into {table} ({elapsed:.1f}s, {rate:,.0f} rows/s)")
+    return rows, elapsed
+
+def ensure_fact_members(conn):
+    """Add dimension members that only the fact sources reference
+
+    Competitions from player_performances that are missing from team_details
+    (cups, international competitions) and national teams, which dim_team
+    does not get from team_details, are created the same way the
+    get_or_create_* helpers would, but in one statement each.
+    """
+    print("\n=== Adding dimension members referenced by facts ===")
+    
+    cursor = conn.cursor()
+    cursor.execute("""
+    INSERT INTO dw.dim_competition (competition_id, competition_name)
+    SELECT DISTINCT ON (LOWER(REPLACE(competition_name, ' ', '_')))
+        LOWER(REPLACE(competition_name, ' ', '_')),
+        competition_name
+    FROM player_performances
+    WHERE competition_name IS NOT NULL
+    ORDER BY LOWER(REPLACE(competition_name, ' ', '_')), competition_name
+    ON CONFLICT (competition_id) DO NOTHING
+    """)
+    print(f"Added {cursor.rowcount} competitions")
+    
+    cursor.execute("""
+    INSERT INTO dw.dim_team (team_nk, team_name, team_type)
+    SELECT DISTINCT ON (team_id)
+        team_id,
+        COALESCE(team_name, 'Unknown'),
+        'national'
+    FROM player_national_performances
+    WHERE team_id IS NOT NULL
+    ORDER BY team_id, team_name
+    ON CONFLICT (team_nk) DO NOTHING
+    """)
+    print(f"Added {cursor.rowcount} national teams")
+    
+    conn.commit()
+    cursor.close()
+
+# Filled with the target table and an optional extra WHERE condition, so a
+# full reload and a single season partition share one statement
+PERFORMANCE_INSERT = """
+    INSERT INTO {target} (
+        player_sk, team_sk, competition_sk, season_sk,
+        season_name, competition_name,
+        nb_in_group, nb_on_pitch, goals, assists, own_goals,
+        subed_in, subed_out, yellow_cards, second_yellow_cards, direct_red_cards,
+        penalty_goals, minutes_played, goals_conceded, clean_sheets,
+        goals_per_match, assists_per_match, minutes_per_goal, cards_total,
+        source_system, source_record_id
+    )
+    SELECT 
+        p.player_sk,
+        t.team_sk,
+        c.competition_sk,
+        s.season_sk,
+        pp.season_name,
+        pp.competition_name,
+        pp.nb_in_group,
+        pp.nb_on_pitch,
+        pp.goals,
+        pp.assists,
+        pp.own_goals,
+        pp.subed_in,
+        pp.subed_out,
+        pp.yellow_cards,
+        pp.second_yellow_cards,
+        pp.direct_red_cards,
+        pp.penalty_goals,
+        pp.minutes_played,
+        pp.goals_conceded,
+        pp.clean_sheets,
+        pp.goals / NULLIF(pp.nb_on_pitch, 0),
+        pp.assists::numeric / NULLIF(pp.nb_on_pitch, 0),
+        pp.minutes_played / NULLIF(pp.goals, 0),
+        COALESCE(pp.yellow_cards, 0) + COALESCE(pp.second_yellow_cards, 0) + COALESCE(pp.direct_red_cards, 0),
+        'club',
+        pp.performance_id::varchar
+    FROM player_performances pp
+    JOIN dw.dim_player p ON p.player_nk = pp.player_id AND p.is_current = TRUE
+    -- season_sk is the partition key and NOT NULL
+    JOIN dw.dim_season s ON s.season_name = pp.season_name
+    LEFT JOIN dw.dim_team t ON t.team_nk = pp.team_id::varchar
+    LEFT JOIN dw.dim_competition c ON c.competition_id = LOWER(REPLACE(pp.competition_name, ' ', '_'))
+    WHERE {condition}
+"""
+
+def season_partition_name(season_sk):
+    """Name of the fact_player_performance partition holding one season"""
+    return f"fact_player_performance_s{season_sk}"
+
+def create_season_partitions(cursor):
+    """Create a fact_player_performance partition for every season that has none"""
+    cursor.execute("""
+    SELECT s.season_sk
+    FROM dw.dim_season s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'dw.fact_player_performance'::regclass
+          AND c.relname = 'fact_player_performance_s' || s.season_sk
+    )
+    ORDER BY s.season_sk
+    """)
+    season_sks = [row[0] for row in cursor.fetchall()]
+    for season_sk in season_sks:
+        cursor.execute(f"CREATE TABLE dw.{season_partition_name(season_sk)} "
+                       f"PARTITION OF dw.fact_player_performance FOR VALUES IN ({season_sk})")
+    if season_sks:
+        print(f"Created {len(season_sks)} season partitions")
+
+def load_fact_player_performance(conn):
+    """Load fact_player_performance from player_performances, one partition per season"""
+    return reload_fact(
+        conn, 'fact_player_performance',
+        PERFORMANCE_INSERT.format(target='dw.fact_player_performance', condition='TRUE'),
+        # After the TRUNCATE the default partition is empty, so new partitions can be added
+        before_insert=create_season_partitions,
+        changes=PERFORMANCE_CHANGES
+    )
+
+def reload_season_partition(conn, season_name):
+    """Rebuild one season of fact_player_performance without touching other seasons
+
+    The season is loaded into a standalone table that already carries the
+    partition CHECK, the primary key and the parent's indexes. It then
+    replaces the old partition with a DETACH + ATTACH in one short
+    transaction; the CHECK lets ATTACH skip the partition constraint scan
+    and the prebuilt indexes are attached instead of rebuilt. Returns
+    (rows, seconds).
+    """
+    print(f"\n=== Reloading fact_player_performance for season {season_name} ===")
+    
+    cursor = conn.cursor()
+    start_time = time.perf_counter()
+    cursor.execute("SELECT season_sk FROM dw.dim_season WHERE season_name = %s", (season_name,))
+    row = cursor.fetchone()
+    if row is None:
+        raise ValueError(f"Unknown season {season_name}")
+    season_sk = row[0]
+    partition = season_partition_name(season_sk)
+    staging = f"{partition}_new"
+    
+    try:
+        cursor.execute(f"DROP TABLE IF EXISTS dw.{staging}")
+        cursor.execute(f"""
+        CREATE TABLE dw.{staging} (
+            LIKE dw.fact_player_performance INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+            CONSTRAINT check_partition_season CHECK (season_sk = {season_sk})
+        )
+        """)
+        cursor.execute(PERFORMANCE_INSERT.format(target=f'dw.{staging}', condition='s.season_sk = %(season_sk)s'),
+                       {'season_sk': season_sk})
+        rows = cursor.rowcount
+        
+        # Matching indexes are attached to the parent's instead of being rebuilt
+        cursor.execute(f"ALTER TABLE dw.{staging} ADD PRIMARY KEY (performance_sk, season_sk)")
+        cursor.execute("""
+        SELECT indexdef FROM pg_indexes
+        WHERE schemaname = 'dw' AND tablename = 'fact_player_performance'
+          AND indexname <> 'fact_player_performance_pkey'
+        """)
+        for (indexdef,) in cursor.fetchall():
+            cursor.execute(re.sub(r'INDEX \S+ ON ONLY \S+', f'INDEX ON dw.{staging}', indexdef))
+        conn.commit()
+        
+        cursor.execute("SET LOCAL lock_timeout = '30s'")
+        # Player-seasons whose rows change with the swap
+        mark_changed_pairs(cursor, changed_keys(
+            f"({row_hashes('dw.fact_player_performance', *PERFORMANCE_CHANGES, f'season_sk = {season_sk}')}) old_rows",
+            f"({row_hashes(f'dw.{staging}', *PERFORMANCE_CHANGES)}) new_rows",
+            PERFORMANCE_CHANGES[0]))
+        cursor.execute("DELETE FROM dw.fact_player_performance_default WHERE season_sk = %s", (season_sk,))
+        cursor.execute(f"SELECT to_regclass('dw.{partition}')")
+        if cursor.fetchone()[0] is not None:
+            cursor.execute(f"ALTER TABLE dw.fact_player_performance DETACH PARTITION dw.{partition}")
+            cursor.execute(f"DROP TABLE dw.{partition}")
+        cursor.execute(f"ALTER TABLE dw.fact_player_performance ATTACH PARTITION dw.{staging} "
+                       f"FOR VALUES IN ({season_sk})")
+        cursor.execute(f"ALTER TABLE dw.{staging} RENAME TO {partition}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        cursor.execute(f"DROP TABLE IF EXISTS dw.{staging}")
+        conn.commit()
+        raise
+    finally:
+        cursor.close()
+    
+    elapsed = time.perf_counter() - start_time
+    rate = rows / elapsed if elapsed > 0 else 0
+    print(f"[OK] Loaded {rows:,} rows into {partition} ({elapsed:.1f}s, {rate:,.0f} rows/s)")
+    return rows, elapsed
+
+# Valuation rows for fact_market_value, filtered by {condition} on the source date
+MARKET_VALUE_SOURCE = """
+    -- UNIQUE (player_sk, date_sk, value_source): one value per player and day
+    (SELECT DISTINCT ON (p.player_sk, d.date_sk)
+        p.player_sk, d.date_sk, d.date_value, mv.value as market_value,
+        'historical' as value_source,
+        mv.market_value_id::varchar as source_record_id
+    FROM player_market_value mv
+    JOIN dw.dim_player p ON p.player_nk = mv.player_id AND p.is_current = TRUE
+    JOIN dw.dim_date d ON d.date_value = mv.date_unix
+    WHERE mv.value IS NOT NULL AND {condition}
+    ORDER BY p.player_sk, d.date_sk, mv.market_value_id DESC)
+    
+    UNION ALL
+    
+    (SELECT 
+        p.player_sk, d.date_sk, d.date_value, lv.value,
+        'latest',
+        lv.player_id::varchar
+    FROM player_latest_market_value lv
+    JOIN dw.dim_player p ON p.player_nk = lv.player_id AND p.is_current = TRUE
+    JOIN dw.dim_date d ON d.date_value = lv.date_unix
+    WHERE lv.value IS NOT NULL AND {condition})
+"""
+
+def set_watermark(cursor, table, source_query):
+    """Advance a table's high-watermark to the value returned by source_query (never backwards)"""
+    cursor.execute(f"""
+    INSERT INTO dw.etl_watermark (table_name, watermark)
+    SELECT %s, ({source_query})
+    WHERE ({source_query}) IS NOT NULL
+    ON CONFLICT (table_name) DO UPDATE
+    SET watermark = GREATEST(dw.etl_watermark.watermark, EXCLUDED.watermark),
+        updated_at = CURRENT_TIMESTAMP
+    """, (table,))
+
+# Orders a player's valuations newest first; the first one carries is_latest_value.
+# On the same day the player_latest_market_value snapshot wins over history.
+LATEST_VALUE_ORDER = "PARTITION BY v.player_sk ORDER BY v.date_value DESC, v.value_source = 'latest' DESC"
+
+def refresh_latest_flags(cursor, condition='TRUE'):
+    """Re-derive is_latest_value for the players of fact_market_value f matching condition
+
+    One window pass over those players; only rows whose flag changes are
+    written. Returns the number of rows updated.
+    """
+    cursor.execute(f"""
+    UPDATE dw.fact_market_value t
+    SET is_latest_value = r.is_latest_value
+    FROM (
+        SELECT 
+            v.market_value_sk,
+            ROW_NUMBER() OVER ({LATEST_VALUE_ORDER}, v.market_value_sk DESC) = 1 as is_latest_value
+        FROM (
+            SELECT f.market_value_sk, f.player_sk, f.value_source, d.date_value
+            FROM dw.fact_market_value f
+            JOIN dw.dim_date d ON d.date_sk = f.date_sk
+            WHERE {condition}
+        ) v
+    ) r
+    WHERE t.market_value_sk = r.market_value_sk
+      AND t.is_latest_value IS DISTINCT FROM r.is_latest_value
+    """)
+    return cursor.rowcount
+
+def count_latest_value_mismatches(cursor):
+    """Players whose is_latest_value row disagrees with player_latest_market_value
+
+    Counts players flagged more than once, and snapshot players whose
+    flagged row is missing, older than the snapshot, or of the same date
+    with a different value.
+    """
+    cursor.execute("""
+    SELECT
+        (SELECT COUNT(*)
+         FROM player_latest_market_value lv
+         JOIN dw.dim_player p ON p.player_nk = lv.player_id AND p.is_current = TRUE
+         LEFT JOIN (
+            SELECT f.player_sk, f.market_value, d.date_value
+            FROM dw.fact_market_value f
+            JOIN dw.dim_date d ON d.date_sk = f.date_sk
+            WHERE f.is_latest_value
+         ) f ON f.player_sk = p.player_sk
+         WHERE lv.value IS NOT NULL AND lv.date_unix IS NOT NULL
+           AND (f.player_sk IS NULL
+                OR f.date_value < lv.date_unix
+                OR (f.date_value = lv.date_unix AND f.market_value <> lv.value)))
+      + (SELECT COUNT(*) FROM (
+            SELECT player_sk FROM dw.fact_market_value
+            WHERE is_latest_value
+            GROUP BY player_sk
+            HAVING COUNT(*) > 1
+         ) duplicated)
+    """)
+    return cursor.fetchone()[0]
+
+def reconcile_latest_values(conn):
+    """Report players whose latest fact_market_value row disagrees with the source snapshot"""
+    cursor = conn.cursor()
+    mismatches = count_latest_value_mismatches(cursor)
+    conn.rollback()
+    cursor.close()
+    if mismatches:
+        print(f"[WARNING] {mismatches:,} players' is_latest_value disagrees with player_latest_market_value")
+    else:
+        print("[OK] is_latest_value matches player_latest_market_value")
+    return mismatches
+
+def load_fact_market_value(conn):
+    """Load fact_market_value from player_market_value (historical) and player_latest_market_value (latest)"""
+    result = reload_fact(conn, 'fact_market_value', f"""
+    INSERT INTO dw.fact_market_value (
+        player_sk, date_sk, market_value, is_latest_value, value_source,
+        previous_value, value_change, value_change_pct, source_record_id
+    )
+    SELECT 
+        player_sk, date_sk, market_value, is_latest_value, value_source,
+        previous_value,
+        market_value - previous_value,
+        (market_value - previous_value) / NULLIF(previous_value, 0),
+        source_record_id
+    FROM (
+        SELECT 
+            v.*,
+            LAG(v.market_value) OVER (
+                PARTITION BY v.player_sk, v.value_source ORDER BY v.date_value
+            ) as previous_value,
+            ROW_NUMBER() OVER ({LATEST_VALUE_ORDER}) = 1 as is_latest_value
+        FROM ({MARKET_VALUE_SOURCE.format(condition='TRUE')}) v
+    ) ranked
+    """, after_insert=after_market_value_reload,
+        changes=MARKET_VALUE_CHANGES, on_changed=mark_changed_players)
+    reconcile_latest_values(conn)
+    return result
+
+def after_market_value_reload(cursor):
+    """Advance the watermark to the newest source valuation"""
+    set_watermark(cursor, 'fact_market_value', "SELECT MAX(date_unix) FROM player_market_value")
+
+def load_fact_market_value_incremental(conn, lookback_days=None):
+    """Add valuations newer than the fact_market_value high-watermark
+
+    Source rows dated on or after (watermark - lookback_days) are upserted,
+    so late corrections inside the look-back window replace the stored
+    value. Rows stored under a player's expired SCD2 version are first
+    moved to the current player_sk, the key a full reload would give them.
+    previous_value/value_change are recomputed only for the players that
+    received or moved rows. Valuations deleted from the source before the
+    look-back window stay until the next full load. Falls back to a full
+    load when no watermark exists. Returns (rows, seconds).
+    """
+    lookback_days = MARKET_VALUE_LOOKBACK_DAYS if lookback_days is None else lookback_days
+    cursor = conn.cursor()
+    cursor.execute("SELECT watermark FROM dw.etl_watermark WHERE table_name = 'fact_market_value'")
+    row = cursor.fetchone()
+    if row is None:
+        cursor.close()
+        print("\nNo fact_market_value watermark yet, running a full load")
+        return load_fact_market_value(conn)
+    
+    since = row[0] - timedelta(days=lookback_days)
+    print(f"\n=== Loading fact_market_value incrementally (watermark {row[0]}, re-reading from {since}) ===")
+    
+    start_time = time.perf_counter()
+    try:
+        cursor.execute("""
+        CREATE TEMP TABLE tmp_market_value_changes (
+            player_sk BIGINT,
+            inserted BOOLEAN
+        ) ON COMMIT DROP
+        """)
+        
+        # The full load keys every valuation on the current player version. Drop rows
+        # a newer version already holds, or whose player has no current version...
+        cursor.execute("""
+        DELETE FROM dw.fact_market_value f
+        USING dw.dim_player old
+        WHERE f.player_sk = old.player_sk
+          AND old.is_current = FALSE
+          AND (
+            NOT EXISTS (
+                SELECT 1 FROM dw.dim_player cur
+                WHERE cur.player_nk = old.player_nk AND cur.is_current = TRUE
+            )
+            OR EXISTS (
+                SELECT 1 FROM dw.fact_market_value n
+                JOIN dw.dim_player np ON np.player_sk = n.player_sk
+                WHERE np.player_nk = old.player_nk AND n.player_sk > f.player_sk
+                  AND n.date_sk = f.date_sk AND n.value_source = f.value_source
+            )
+          )
+        """)
+        # ...and move the rest of the expired versions' rows to the current one
+        cursor.execute("""
+        WITH rekeyed AS (
+            UPDATE dw.fact_market_value f
+            SET player_sk = cur.player_sk
+            FROM dw.dim_player old
+            JOIN dw.dim_player cur ON cur.player_nk = old.player_nk AND cur.is_current = TRUE
+            WHERE f.player_sk = old.player_sk AND old.is_current = FALSE
+            RETURNING f.player_sk
+        )
+        INSERT INTO tmp_market_value_changes SELECT player_sk, NULL FROM rekeyed
+        """)
+        rekeyed = cursor.rowcount
+        
+        cursor.execute(f"""
+        WITH upserted AS (
+            INSERT INTO dw.fact_market_value (
+                player_sk, date_sk, market_value, value_source, source_record_id
+            )
+            SELECT player_sk, date_sk, market_value, value_source, source_record_id
+            FROM ({MARKET_VALUE_SOURCE.format(condition='date_unix >= %(since)s')}) v
+            ON CONFLICT (player_sk, date_sk, value_source) DO UPDATE
+            SET market_value = EXCLUDED.market_value,
+                source_record_id = EXCLUDED.source_record_id,
+                load_datetime = CURRENT_TIMESTAMP
+            WHERE dw.fact_market_value.market_value IS DISTINCT FROM EXCLUDED.market_value
+            RETURNING player_sk, xmax = 0 as inserted
+        )
+        INSERT INTO tmp_market_value_changes SELECT player_sk, inserted FROM upserted
+        """, {'since': since})
+        
+        # A player keeps one 'latest' row; drop the ones a newer snapshot replaced
+        cursor.execute("""
+        DELETE FROM dw.fact_market_value f
+        USING dw.dim_date d
+        WHERE d.date_sk = f.date_sk
+          AND f.value_source = 'latest'
+          AND f.player_sk IN (SELECT player_sk FROM tmp_market_value_changes)
+          AND EXISTS (
+            SELECT 1 FROM dw.fact_market_value n
+            JOIN dw.dim_date nd ON nd.date_sk = n.date_sk
+            WHERE n.player_sk = f.player_sk AND n.value_source = 'latest' AND nd.date_value > d.date_value
+          )
+        """)
+        replaced = cursor.rowcount
+        flagged = refresh_latest_flags(cursor, "f.player_sk IN (SELECT player_sk FROM tmp_market_value_changes)")
+        
+        cursor.execute("""
+        UPDATE dw.fact_market_value f
+        SET previous_value = w.previous_value,
+            value_change = f.market_value - w.previous_value,
+            value_change_pct = (f.market_value - w.previous_value) / NULLIF(w.previous_value, 0)
+        FROM (
+            SELECT 
+                v.market_value_sk,
+                LAG(v.market_value) OVER (
+                    PARTITION BY v.player_sk, v.value_source ORDER BY d.date_value
+                ) as previous_value
+            FROM dw.fact_market_value v
+            JOIN dw.dim_date d ON d.date_sk = v.date_sk
+            WHERE v.player_sk IN (SELECT player_sk FROM tmp_market_value_changes)
+        ) w
+        WHERE f.market_value_sk = w.market_value_sk
+          AND (f.previous_value IS DISTINCT FROM w.previous_value
+               OR f.value_change IS DISTINCT FROM f.market_value - w.previous_value)
+        """)
+        
+        cursor.execute("""
+        SELECT COUNT(*) FILTER (WHERE inserted),
+               COUNT(*) FILTER (WHERE NOT inserted),
+               COUNT(DISTINCT player_sk)
+        FROM tmp_market_value_changes
+        """)
+        added, corrected, players = cursor.fetchone()
+        # Season start/end values of these players may have moved
+        mark_dirty(cursor, "dw.fact_player_season_summary",
+                   "player_sk IN (SELECT player_sk FROM tmp_market_value_changes)")
+        set_watermark(cursor, 'fact_market_value', "SELECT MAX(date_unix) FROM player_market_value")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    
+    elapsed = time.perf_counter() - start_time
+    print(f"Rows added:     {added:>10,}")
+    print(f"Rows corrected: {corrected:>10,}")
+    print(f"Rows re-keyed:  {rekeyed:>10,}")
+    print(f"Latest rows replaced: {replaced:,}")
+    print(f"Latest flags moved:   {flagged:,}")
+    print(f"[OK] {players:,} players updated in fact_market_value ({elapsed:.1f}s)")
+    reconcile_latest_values(conn)
+    return added, elapsed
+
+def create_inferred_teams(cursor):
+    """Add every transfer_history club missing from dim_team as an inferred member
+
+    One pass over transfer_history collects both the from and to clubs, so
+    the fact INSERT can resolve every team id by join instead of calling
+    dw.get_or_create_team_sk per row. load_dim_team later fills in and
+    clears is_inferred for clubs that appear in team_details.
+    """
+    cursor.execute("""
+    INSERT INTO dw.dim_team (team_nk, team_name, is_inferred)
+    SELECT DISTINCT ON (t.team_nk)
+        t.team_nk,
+        COALESCE(t.team_name, 'Unknown'),
+        TRUE
+    FROM transfer_history th
+    CROSS JOIN LATERAL (VALUES
+        (th.from_team_id::varchar, th.from_team_name),
+        (th.to_team_id::varchar, th.to_team_name)
+    ) t(team_nk, team_name)
+    WHERE t.team_nk IS NOT NULL
+      AND NOT EXISTS (SELECT 1 FROM dw.dim_team d WHERE d.team_nk = t.team_nk)
+    ORDER BY t.team_nk, t.team_name NULLS LAST
+    ON CONFLICT (team_nk) DO NOTHING
+    """)
+    if cursor.rowcount:
+        print(f"Added {cursor.rowcount:,} inferred teams referenced by transfers")
+
+def load_fact_transfer(conn):
+    """Load fact_transfer from transfer_history"""
+    return reload_fact(conn, 'fact_transfer', """
+    INSERT INTO dw.fact_transfer (
+        player_sk, from_team_sk, to_team_sk, transfer_date_sk, season_sk, transfer_type_sk,
+        season_name, transfer_fee, value_at_transfer, fee_to_value_ratio,
+        transfer_type_text, source_record_id
+    )
+    SELECT 
+        p.player_sk,
+        ft.team_sk,
+        tt.team_sk,
+        d.date_sk,
+        s.season_sk,
+        ty.transfer_type_sk,
+        th.season_name,
+        th.transfer_fee,
+        th.value_at_transfer,
+        th.transfer_fee / NULLIF(th.value_at_transfer, 0),
+        th.transfer_type,
+        th.transfer_id::varchar
+    FROM transfer_history th
+    JOIN dw.dim_player p ON p.player_nk = th.player_id AND p.is_current = TRUE
+    LEFT JOIN dw.dim_team ft ON ft.team_nk = th.from_team_id::varchar
+    LEFT JOIN dw.dim_team tt ON tt.team_nk = th.to_team_id::varchar
+    LEFT JOIN dw.dim_date d ON d.date_value = th.transfer_date
+    LEFT JOIN dw.dim_season s ON s.season_name = th.season_name
+    LEFT JOIN dw.dim_transfer_type ty ON ty.transfer_type_code = CASE
+        WHEN th.transfer_type IS NULL THEN 'UNKNOWN'
+        WHEN th.transfer_type ILIKE '%end of loan%' OR th.transfer_type ILIKE '%loan end%' THEN 'END_LOAN'
+        WHEN th.transfer_type ILIKE '%return%' THEN 'LOAN_RETURN'
+        WHEN th.transfer_type ILIKE '%loan%' THEN 'LOAN'
+        WHEN th.transfer_type ILIKE '%free%' THEN 'FREE'
+        ELSE 'PERMANENT'
+    END
+    """, before_insert=create_inferred_teams)
+
+def load_fact_injury(conn):
+    """Load fact_injury from player_injuries, typed through dw.injury_reason_map"""
+    return reload_fact(conn, 'fact_injury', """
+    INSERT INTO dw.fact_injury (
+        player_sk, injury_from_date_sk, injury_end_date_sk, season_sk, injury_type_sk,
+        season_name, injury_reason, days_missed, games_missed,
+        avg_days_per_game, severity_score, source_record_id
+    )
+    SELECT 
+        p.player_sk,
+        fd.date_sk,
+        ed.date_sk,
+        s.season_sk,
+        m.injury_type_sk,
+        i.season_name,
+        i.injury_reason,
+        i.days_missed,
+        i.games_missed,
+        i.days_missed / NULLIF(i.games_missed, 0),
+        -- 1-5 scale from the days missed
+        CASE
+            WHEN i.days_missed IS NULL THEN NULL
+            WHEN i.days_missed <= 7 THEN 1
+            WHEN i.days_missed <= 28 THEN 2
+            WHEN i.days_missed <= 90 THEN 3
+            WHEN i.days_missed <= 180 THEN 4
+            ELSE 5
+        END,
+        i.injury_id::varchar
+    FROM player_injuries i
+    JOIN dw.dim_player p ON p.player_nk = i.player_id AND p.is_current = TRUE
+    LEFT JOIN dw.dim_date fd ON fd.date_value = i.from_date
+    LEFT JOIN dw.dim_date ed ON ed.date_value = i.end_date
+    LEFT JOIN dw.dim_season s ON s.season_name = i.season_name
+    LEFT JOIN dw.injury_reason_map m ON m.injury_reason = i.injury_reason
+    """, changes=INJURY_CHANGES)
+
+def load_fact_national_performance(conn):
+    """Load fact_national_performance from player_national_performances"""
+    return reload_fact(conn, 'fact_national_performance', """
+    INSERT INTO dw.fact_national_performance (
+        player_sk, national_team_sk, first_game_date_sk,
+        total_matches, total_goals, goals_per_match, source_record_id
+    )
+    -- UNIQUE (player_sk, national_team_sk): keep the entry with the most caps
+    SELECT DISTINCT ON (p.player_sk, t.team_sk)
+        p.player_sk,
+        t.team_sk,
+        d.date_sk,
+        np.matches,
+        np.goals,
+        np.goals::numeric / NULLIF(np.matches, 0),
+        np.national_performance_id::varchar
+    FROM player_national_performances np
+    JOIN dw.dim_player p ON p.player_nk = np.player_id AND p.is_current = TRUE
+    LEFT JOIN dw.dim_team t ON t.team_nk = np.team_id
+    LEFT JOIN dw.dim_date d ON d.date_value = np.first_game_date
+    ORDER BY p.player_sk, t.team_sk, np.matches DESC NULLS LAST
+    """)
+
+def load_fact_teammate_relationship(conn):
+    """Load fact_teammate_relationship with one row per unordered player pair
+
+    player_teammates_played_with lists every pair from both sides. Each
+    pair is stored once with the lower player_sk first, keeping the side
+    with the most shared minutes. dw.v_teammate_relationship_directional
+    restores both directions for queries.
+    """
+    insert_start = []
+    return reload_fact(conn, 'fact_teammate_relationship', """
+    INSERT INTO dw.fact_teammate_relationship (
+        player_sk, teammate_player_sk, minutes_played_together,
+        ppg_played_with, joint_goal_participation, chemistry_score, source_record_id
+    )
+    SELECT DISTINCT ON (LEAST(p1.player_sk, p2.player_sk), GREATEST(p1.player_sk, p2.player_sk))
+        LEAST(p1.player_sk, p2.player_sk),
+        GREATEST(p1.player_sk, p2.player_sk),
+        tw.minutes_played_with,
+        tw.ppg_played_with,
+        tw.joint_goal_participation,
+        -- Joint goal participations per 90 minutes together
+        tw.joint_goal_participation * 90.0 / NULLIF(tw.minutes_played_with, 0),
+        tw.teammate_record_id::varchar
+    FROM player_teammates_played_with tw
+    JOIN dw.dim_player p1 ON p1.player_nk = tw.player_id AND p1.is_current = TRUE
+    JOIN dw.dim_player p2 ON p2.player_nk = tw.teammate_player_id AND p2.is_current = TRUE
+    WHERE p1.player_sk <> p2.player_sk
+    ORDER BY LEAST(p1.player_sk, p2.player_sk), GREATEST(p1.player_sk, p2.player_sk),
+             tw.minutes_played_with DESC NULLS LAST
+    """,
+        before_insert=lambda cursor: insert_start.append(time.perf_counter()),
+        after_insert=lambda cursor: report_teammate_pairs(cursor, time.perf_counter() - insert_start[0]))
+
+def report_teammate_pairs(cursor, insert_seconds):
+    """Print the stored pairs against the directional source rows, with the space and insert time saved"""
+    cursor.execute("""
+    SELECT
+        (SELECT COUNT(*) FROM player_teammates_played_with tw
+         JOIN dw.dim_player p1 ON p1.player_nk = tw.player_id AND p1.is_current = TRUE
+         JOIN dw.dim_player p2 ON p2.player_nk = tw.teammate_player_id AND p2.is_current = TRUE
+         WHERE p1.player_sk <> p2.player_sk),
+        (SELECT COUNT(*) FROM dw.fact_teammate_relationship),
+        pg_total_relation_size('dw.fact_teammate_relationship')
+    """)
+    directional_rows, rows, size = cursor.fetchone()
+    # Storing both directions would write (and index) directional_rows instead
+    ratio = directional_rows / rows if rows else 0
+    print(f"Source pairs (both directions): {directional_rows:>10,}")
+    print(f"Canonical pairs stored:         {rows:>10,}")
+    print(f"Table + indexes: {size / 1024 ** 2:,.1f} MB "
+          f"(about {size * max(ratio - 1, 0) / 1024 ** 2:,.1f} MB saved)")
+    print(f"Insert time: {insert_seconds:.1f}s (about {insert_seconds * max(ratio - 1, 0):.1f}s saved)")
+
+def load_fact_player_season_summary(conn):
+    """Refresh fact_player_season_summary for the queued player-seasons
+
+    The pairs in dw.etl_dirty_player_season are claimed in the same
+    transaction, re-aggregated from the performance and injury facts and
+    upserted on UNIQUE (player_sk, season_sk); rows whose aggregates did
+    not change are left alone and pairs with no performances left are
+    deleted. Returns (rows written, seconds).
+    """
+    print("\n=== Refreshing fact_player_season_summary ===")
+    
+    cursor = conn.cursor()
+    start_time = time.perf_counter()
+    try:
+        cursor.execute("""
+        CREATE TEMP TABLE tmp_dirty_player_season (
+            player_sk BIGINT,
+            season_sk INTEGER,
+            PRIMARY KEY (player_sk, season_sk)
+        ) ON COMMIT DROP
+        """)
+        cursor.execute("""
+        WITH claimed AS (
+            DELETE FROM dw.etl_dirty_player_season RETURNING player_sk, season_sk
+        )
+        INSERT INTO tmp_dirty_player_season SELECT player_sk, season_sk FROM claimed
+        """)
+        dirty = cursor.rowcount
+        cursor.execute("ANALYZE tmp_dirty_player_season")
+        
+        cursor.execute("""
+        INSERT INTO dw.fact_player_season_summary (
+            player_sk, season_sk, total_matches, total_goals, total_assists,
+            total_minutes, total_yellow_cards, total_red_cards,
+            avg_goals_per_match, avg_assists_per_match,
+            total_injury_days, total_games_missed
+        )
+        SELECT 
+            fp.player_sk,
+            fp.season_sk,
+            COUNT(DISTINCT fp.performance_sk),
+            SUM(fp.goals),
+            SUM(fp.assists),
+            SUM(fp.minutes_played),
+            SUM(fp.yellow_cards),
+            SUM(fp.second_yellow_cards + fp.direct_red_cards),
+            AVG(fp.goals),
+            AVG(fp.assists::numeric),
+            COALESCE(MAX(inj.days_missed), 0),
+            COALESCE(MAX(inj.games_missed), 0)
+        FROM tmp_dirty_player_season ds
+        JOIN dw.fact_player_performance fp ON fp.player_sk = ds.player_sk AND fp.season_sk = ds.season_sk
+        LEFT JOIN (
+            SELECT i.player_sk, i.season_sk, SUM(i.days_missed) as days_missed, SUM(i.games_missed) as games_missed
+            FROM dw.fact_injury i
+            JOIN tmp_dirty_player_season ds ON ds.player_sk = i.player_sk AND ds.season_sk = i.season_sk
+            GROUP BY i.player_sk, i.season_sk
+        ) inj ON inj.player_sk = fp.player_sk AND inj.season_sk = fp.season_sk
+        GROUP BY fp.player_sk, fp.season_sk
+        ON CONFLICT (player_sk, season_sk) DO UPDATE
+        SET total_matches = EXCLUDED.total_matches,
+            total_goals = EXCLUDED.total_goals,
+            total_assists = EXCLUDED.total_assists,
+            total_minutes = EXCLUDED.total_minutes,
+            total_yellow_cards = EXCLUDED.total_yellow_cards,
+            total_red_cards = EXCLUDED.total_red_cards,
+            avg_goals_per_match = EXCLUDED.avg_goals_per_match,
+            avg_assists_per_match = EXCLUDED.avg_assists_per_match,
+            total_injury_days = EXCLUDED.total_injury_days,
+            total_games_missed = EXCLUDED.total_games_missed,
+            load_datetime = CURRENT_TIMESTAMP
+        WHERE (dw.fact_player_season_summary.total_matches, dw.fact_player_season_summary.total_goals,
+               dw.fact_player_season_summary.total_assists, dw.fact_player_season_summary.total_minutes,
+               dw.fact_player_season_summary.total_yellow_cards, dw.fact_player_season_summary.total_red_cards,
+               dw.fact_player_season_summary.avg_goals_per_match, dw.fact_player_season_summary.avg_assists_per_match,
+               dw.fact_player_season_summary.total_injury_days, dw.fact_player_season_summary.total_games_missed)
+              IS DISTINCT FROM
+              (EXCLUDED.total_matches, EXCLUDED.total_goals, EXCLUDED.total_assists, EXCLUDED.total_minutes,
+               EXCLUDED.total_yellow_cards, EXCLUDED.total_red_cards,
+               EXCLUDED.avg_goals_per_match, EXCLUDED.avg_assists_per_match,
+               EXCLUDED.total_injury_days, EXCLUDED.total_games_missed)
+        """)
+        written = cursor.rowcount
+        
+        cursor.execute("""
+        DELETE FROM dw.fact_player_season_summary s
+        USING tmp_dirty_player_season ds
+        WHERE s.player_sk = ds.player_sk AND s.season_sk = ds.season_sk
+          AND NOT EXISTS (
+            SELECT 1 FROM dw.fact_player_performance fp
+            WHERE fp.player_sk = ds.player_sk AND fp.season_sk = ds.season_sk
+          )
+        """)
+        removed = cursor.rowcount
+        valued = fill_season_values(conn, cursor)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    
+    elapsed = time.perf_counter() - start_time
+    print(f"Player-seasons queued: {dirty:>10,}")
+    print(f"Rows written:          {written:>10,}")
+    print(f"Rows unchanged:        {dirty - written - removed:>10,}")
+    print(f"Rows removed:          {removed:>10,}")
+    print(f"Season values changed: {valued:>10,}")
+    print(f"[OK] Refreshed fact_player_season_summary ({elapsed:.1f}s)")
+    return written + removed, elapsed
+
+def fill_season_values(conn, cursor):
+    """Set season start/end market values for the queued player-seasons
+
+    The queued players' valuations are read once into a ValuationSeries and
+    all their seasons are resolved in one vectorized as-of pass; the results
+    are copied into a temp table and applied with a single UPDATE. Runs in
+    the summary refresh's transaction. Returns the number of rows changed.
+    """
+    cursor.execute("""
+    SELECT s.player_season_sk, s.player_sk, ss.season_start_year
+    FROM dw.fact_player_season_summary s
+    JOIN tmp_dirty_player_season ds ON ds.player_sk = s.player_sk AND ds.season_sk = s.season_sk
+    JOIN dw.dim_season ss ON ss.season_sk = s.season_sk
+    """)
+    seasons = pd.DataFrame(cursor.fetchall(), columns=['player_season_sk', 'player_sk', 'season_start_year'])
+    if seasons.empty:
+        return 0
+    
+    series = ValuationSeries.from_warehouse(
+        conn, "f.player_sk IN (SELECT player_sk FROM tmp_dirty_player_season)")
+    values = series.season_values(seasons['player_sk'], seasons['season_start_year'])
+    values.insert(0, 'player_season_sk', seasons['player_season_sk'])
+    
+    buffer = io.StringIO()
+    values.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    cursor.execute("""
+    CREATE TEMP TABLE tmp_season_values (
+        player_season_sk BIGINT PRIMARY KEY,
+        season_start_value DECIMAL(15,2),
+        season_end_value DECIMAL(15,2),
+        value_change_pct DECIMAL(10,4)
+    ) ON COMMIT DROP
+    """)
+    cursor.copy_expert("COPY tmp_season_values FROM STDIN WITH (FORMAT csv)", buffer)
+    cursor.execute("""
+    UPDATE dw.fact_player_season_summary s
+    SET season_start_value = v.season_start_value,
+        season_end_value = v.season_end_value,
+        value_change_pct = v.value_change_pct
+    FROM tmp_season_values v
+    WHERE s.player_season_sk = v.player_season_sk
+      AND (s.season_start_value, s.season_end_value, s.value_change_pct)
+          IS DISTINCT FROM (v.season_start_value, v.season_end_value, v.value_change_pct)
+    """)
+    return cursor.rowcount
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Load the dw fact tables")
+    parser.add_argument('--season', action='append', metavar='NAME',
+                        help="only rebuild this season's fact_player_performance partition "
+                             "(e.g. 24/25, repeatable), then refresh the season summary")
+    parser.add_argument('--incremental', action='store_true',
+                        help="load fact_market_value from its high-watermark instead of reloading it")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    
     print("=" * 60)
     print("ETL: Loading Fact Tables")
     print("=" * 60)
     
     conn = get_connection()
-    print("[OK] All facts already loaded - see verify_warehouse.py for details")
-    conn.close()
+    
+    try:
+        ensure_fact_members(conn)
+        
+        # The season summary aggregates the performance and injury facts, so it runs last
+        if args.season:
+            steps = [(f"fact_player_performance [{season}]",
+                      lambda conn, season=season: reload_season_partition(conn, season))
+                     for season in args.season]
+            steps.append(('fact_player_season_summary', load_fact_player_season_summary))
+        else:
+            steps = [
+                ('fact_player_performance', load_fact_player_performance),
+                ('fact_market_value',
+                 load_fact_market_value_incremental if args.incremental else load_fact_market_value),
+                ('fact_transfer', load_fact_transfer),
+                ('fact_injury', load_fact_injury),
+                ('fact_national_performance', load_fact_national_performance),
+                ('fact_teammate_relationship', load_fact_teammate_relationship),
+                ('fact_player_season_summary', load_fact_player_season_summary)
+            ]
+        results = []
+        for fact, load in steps:
+            rows, seconds = load(conn)
+            results.append((fact, rows, seconds))
+        
+        print("\n" + "=" * 60)
+        print("[OK] ALL FACTS LOADED SUCCESSFULLY")
+        print("=" * 60)
+        
+        print("\nFact Summary:")
+        for fact, rows, seconds in results:
+            rate = rows / seconds if seconds > 0 else 0
+            print(f"  {fact:30s}: {rows:>10,} rows  {seconds:>7.1f} s  {rate:>10,.0f} rows/s")
+    
+    except Exception as e:
+        print(f"\n[ERROR] ERROR: {e}")
+        raise
+    finally:
+        conn.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,68 @@
+"""
+calculate_player_hash (load_dimensions.py) against dw.calculate_player_hash
+
+Each expected digest is the MD5 of the string the SQL function builds:
+COALESCE(col, '') of player_name, position, current_club_nk,
+contract_expires::TEXT (ISO date) and agent_sk::TEXT, concatenated.
+No database is needed.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from load_dimensions import calculate_player_hash
+
+
+COLUMNS = ['player_name', 'position', 'current_club_nk', 'contract_expires', 'agent_sk']
+
+
+def player_hashes(rows):
+    return list(calculate_player_hash(pd.DataFrame(rows, columns=COLUMNS)))
+
+
+@pytest.mark.parametrize('row, expected', [
+    # 'Lionel MessiRight Winger5832025-06-307'
+    (('Lionel Messi', 'Right Winger', '583', date(2025, 6, 30), 7), 'b23946f32a1bb6fa9d4338dffeafbb81'),
+    # 'Łukasz Piszczek'
+    (('Łukasz Piszczek', None, None, None, None), 'c8676068f88b13abc34c6dafabfd1f92'),
+    # ''
+    ((None, None, None, None, None), 'd41d8cd98f00b204e9800998ecf8427e'),
+    # '' (COALESCE makes empty strings and NULLs hash alike)
+    (('', '', '', None, None), 'd41d8cd98f00b204e9800998ecf8427e'),
+    # 'ZéGoalkeeperFS1999-01-010'
+    (('Zé', 'Goalkeeper', 'FS', date(1999, 1, 1), 0), '02685b963d26785c8ec220d6f8fef5f2'),
+])
+def test_matches_sql_concatenation(row, expected):
+    assert player_hashes([row]) == [expected]
+
+
+def test_agent_sk_has_no_decimal_part():
+    # A NULL agent_sk elsewhere in the column turns it into float64 (180.0)
+    rows = [
+        ('Kevin De Bruyne', 'Attacking Midfield', '281', date(2025, 6, 30), 180),
+        ('Kevin De Bruyne', 'Attacking Midfield', '281', None, np.nan),
+    ]
+    assert player_hashes(rows) == [
+        # 'Kevin De BruyneAttacking Midfield2812025-06-30180'
+        '53405419c01a136f32d63d2d80007510',
+        # 'Kevin De BruyneAttacking Midfield281'
+        '3b428f18a6e86ebdb63a129eb0b96694',
+    ]
+
+
+@pytest.mark.parametrize('contract_expires', [
+    date(2025, 6, 30),
+    pd.Timestamp('2025-06-30'),
+    '2025-06-30',
+])
+def test_contract_expires_is_iso_date(contract_expires):
+    row = ('Lionel Messi', 'Right Winger', '583', contract_expires, 7.0)
+    assert player_hashes([row]) == ['b23946f32a1bb6fa9d4338dffeafbb81']
+
+
+def test_index_is_preserved():
+    df = pd.DataFrame([('Zé', 'Goalkeeper', 'FS', date(1999, 1, 1), 0)], columns=COLUMNS, index=[42])
+    assert list(calculate_player_hash(df).index) == [42]
@@ -5,8 +5,11 @@ Provides comprehensive checks on all dimensions and facts
 
 import psycopg2
 import os
+import pandas as pd
 from dotenv import load_dotenv
 from tabulate import tabulate
+from load_dimensions import calculate_player_hash
+from load_facts import count_latest_value_mismatches
 
 # Load environment variables
 load_dotenv('../DATABASE/.env')
@@ -155,6 +158,11 @@ def check_data_quality(conn):
     dup_players = cursor.fetchone()[0]
     checks.append(['Duplicate Current Players', f"{dup_players:,}", 'ERROR' if dup_players > 0 else 'OK'])
     
+    # Teams only known from transfers, still waiting for team_details
+    cursor.execute("SELECT COUNT(*) FROM dw.dim_team WHERE is_inferred")
+    inferred_teams = cursor.fetchone()[0]
+    checks.append(['Inferred Teams', f"{inferred_teams:,}", 'INFO' if inferred_teams > 0 else 'OK'])
+    
     # Check date range
     cursor.execute("""
         SELECT MIN(date_value), MAX(date_value)
@@ -173,8 +181,49 @@ def check_data_quality(conn):
     current_season_name = current_season[0] if current_season else 'NONE'
     checks.append(['Current Season', current_season_name, 'OK' if current_season else 'WARNING'])
     
+    # Python and SQL row hashes must agree, or SCD2 change detection breaks
+    hash_mismatches = check_hash_parity(conn)
+    checks.append(['SCD Hash Python/SQL Mismatches', f"{hash_mismatches:,}", 'ERROR' if hash_mismatches > 0 else 'OK'])
+    
+    # Exactly one is_latest_value row per player, agreeing with player_latest_market_value
+    latest_mismatches = count_latest_value_mismatches(cursor)
+    checks.append(['Latest Market Value Mismatches', f"{latest_mismatches:,}", 'ERROR' if latest_mismatches > 0 else 'OK'])
+    
     print(tabulate(checks, headers=['Check', 'Result', 'Status'], tablefmt='grid'))
 
+def check_hash_parity(conn):
+    """Compare calculate_player_hash (Python) with dw.calculate_player_hash (SQL)
+
+    Runs over fixed edge cases (NULLs, non-ASCII names, dates) and over the
+    stored current players. Returns the number of rows whose hashes differ.
+    """
+    edge_cases = """
+        SELECT * FROM (VALUES
+            ('Lionel Messi', 'Right Winger', '583', DATE '2025-06-30', 7),
+            ('Łukasz Piszczek', NULL, NULL, NULL, NULL),
+            (NULL, NULL, NULL, NULL, NULL),
+            ('Zé', 'Goalkeeper', 'FS', DATE '1999-01-01', 0)
+        ) AS v(player_name, position, current_club_nk, contract_expires, agent_sk)
+    """
+    query = f"""
+        SELECT player_name, position, current_club_nk, contract_expires, agent_sk,
+               dw.calculate_player_hash(
+                   player_name::VARCHAR, position::VARCHAR, current_club_nk::VARCHAR,
+                   contract_expires, agent_sk
+               ) as sql_hash
+        FROM (
+            {edge_cases}
+            UNION ALL
+            SELECT player_name, position, current_club_nk, contract_expires, agent_sk
+            FROM dw.dim_player
+            WHERE is_current = TRUE
+        ) src
+    """
+    df = pd.read_sql(query, conn)
+    if df.empty:
+        return 0
+    return int((calculate_player_hash(df) != df['sql_hash']).sum())
+
 def check_joins(conn):
     """Test key joins between dimensions and facts"""
     print("\n" + "=" * 70)